@@ -1,9 +1,14 @@
 # app.py
-from flask import Flask, request, jsonify, render_template, session
+from flask import Flask, request, jsonify, render_template, session, send_file, abort
 from dotenv import load_dotenv
 import os
+import hmac
+import math
 import google.generativeai as genai
 from chatbot import chatbot_instance
+import config
+import image_processor
+import snapshot_store
 
 load_dotenv()
 app = Flask(__name__)
@@ -32,6 +37,13 @@ def ask_api():
 
     # 수정된 ask 함수에 대화 기록 전달
     result = chatbot_instance.ask(query, chat_history)
+
+    # 첫 번째 참고 유물의 이미지를 지연 로딩용 썸네일 정보로 변환
+    if result.get('metadata'):
+        image = image_processor.describe_image(result['metadata'][0].get('image_url'))
+        if image:
+            result['image'] = image
+            print(f"  🖼️ 이미지 응답 크기: {image['bytes'] / 1024:.1f}KB (원본 {image['original_bytes'] / 1024:.1f}KB)")
     
     # (⭐ 핵심 수정) 대화 기록 업데이트 및 세션에 저장
     if 'error' not in result:
@@ -47,5 +59,70 @@ def clear_history():
     session.clear()
     return jsonify({"status": "cleared"})
 
+# 유물 이미지 제공 (썸네일 선택 + ETag/Cache-Control)
+@app.route('/static/images/<path:filename>')
+def serve_image(filename):
+    entry = image_processor.lookup_image(filename)
+    if entry is None:
+        abort(404)
+    path, variant, mimetype = image_processor.select_variant(
+        entry, request.args.get('w', type=int), request.headers.get('Accept', '')
+    )
+    response = send_file(
+        path, mimetype=mimetype, etag=variant.get('etag') or True,
+        max_age=config.IMAGE_CACHE_MAX_AGE, conditional=True
+    )
+    response.cache_control.public = True
+    response.vary.add('Accept')
+    return response
+
+# 클라이언트가 측정한 답변별 이미지 전송량/렌더링 지연 기록
+@app.route('/metrics/image', methods=['POST'])
+def image_metrics():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "JSON 객체가 필요합니다."}), 400
+    values = {}
+    for field in ('transfer_bytes', 'render_ms'):
+        value = data.get(field, 0)
+        if value is None:
+            value = 0
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+            return jsonify({"error": f"'{field}'는 0 이상의 숫자여야 합니다."}), 400
+        values[field] = value
+    # 클라이언트가 보낸 값이므로 출력 가능한 문자만 남기고 길이를 제한해 로그에 기록
+    src = ''.join(ch for ch in str(data.get('src', ''))[:200] if ch.isprintable())
+    print(f"  🖼️ 이미지 렌더링: {src} - 전송 {values['transfer_bytes'] / 1024:.1f}KB, "
+          f"지연 {values['render_ms']:.0f}ms")
+    return jsonify({"status": "ok"})
+
+# 벡터 스토어 스냅샷 상태 조회 / 교체 / 롤백 (ADMIN_TOKEN 환경 변수가 설정된 경우에만 사용 가능)
+@app.route('/admin/snapshot', methods=['GET', 'POST'])
+def admin_snapshot():
+    admin_token = os.getenv("ADMIN_TOKEN")
+    provided_token = request.headers.get('X-Admin-Token', '')
+    if not admin_token or not hmac.compare_digest(provided_token.encode('utf-8'), admin_token.encode('utf-8')):
+        return jsonify({"error": "권한이 없습니다."}), 403
+
+    if request.method == 'GET':
+        return jsonify(chatbot_instance.snapshot_status())
+
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "JSON 객체가 필요합니다."}), 400
+    action = data.get('action', 'swap')
+    version = data.get('version')
+    try:
+        if action == 'swap':
+            # 요청 본문의 버전은 게시된 스냅샷 목록에 있는 이름만 허용 (경로 조작 방지)
+            if version is not None:
+                snapshot_store.check_version(version)
+            return jsonify(chatbot_instance.swap_snapshot(version))
+        elif action == 'rollback':
+            return jsonify(chatbot_instance.rollback_snapshot())
+        return jsonify({"error": f"알 수 없는 작업입니다: '{action}'"}), 400
+    except (FileNotFoundError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
@@ -0,0 +1,90 @@
+# benchmarks/bench_chunking.py
+"""
+구획(Chunking) 전략별 인덱스 크기, 구축 시간, 검색 재현율(recall@k) 비교.
+
+정답 세트는 상용구 제거 전 원문에서 무작위로 뽑은 문장이며(benchmarks.golden_set.history_questions),
+검색된 상위 k개 구획 중 하나라도 원래 문장의 글자 n-gram 대부분을 포함하면 정답으로 봅니다.
+
+실행: python -m benchmarks.bench_chunking [--model hashing|upskyy/bge-m3-korean] [--questions 300]
+"""
+import argparse
+import pickle
+import faiss
+import pandas as pd
+from chunking import get_chunker, chunk_documents
+from benchmarks.common import load_encoder, encode, load_history_documents, Timer
+from benchmarks.golden_set import history_questions, answer_ngrams, covers_answer
+
+# (표시 이름, 전략, 전략 옵션, 상용구 제거, 중복 제거)
+STRATEGIES = [
+    ('paragraph-1500 (기존)', 'paragraph', {'target_size': 1500}, False, False),
+    ('paragraph-1500 + 상용구/중복 제거', 'paragraph', {'target_size': 1500}, True, True),
+    ('sentence-1500', 'sentence', {'target_size': 1500, 'overlap': 0}, True, True),
+    ('sentence-1500/overlap-150', 'sentence', {'target_size': 1500, 'overlap': 150}, True, True),
+    ('sentence-1200', 'sentence', {'target_size': 1200, 'overlap': 0}, True, True),
+    ('sentence-1000', 'sentence', {'target_size': 1000, 'overlap': 0}, True, True),
+    ('sentence-1000/overlap-200', 'sentence', {'target_size': 1000, 'overlap': 200}, True, True),
+]
+
+
+def evaluate(documents: dict, golden: list, model, ks=(1, 5)) -> list:
+    results = []
+    queries = [q['question'] for q in golden]
+    answers = [answer_ngrams(q['answer_text']) for q in golden]
+    with Timer() as t:
+        query_embeddings = encode(model, queries)
+    query_ms = t.ms / len(queries)
+
+    for label, strategy, options, remove_boilerplate, deduplicate in STRATEGIES:
+        with Timer() as chunk_timer:
+            rows = chunk_documents(documents, get_chunker(strategy, **options), remove_boilerplate, deduplicate)
+        df = pd.DataFrame(rows)
+        texts = df['text_chunk'].tolist()
+
+        with Timer() as encode_timer:
+            embeddings = encode(model, texts)
+        with Timer() as index_timer:
+            index = faiss.IndexFlatL2(embeddings.shape[1])
+            index.add(embeddings)
+
+        index_bytes = faiss.serialize_index(index).nbytes
+        df_bytes = len(pickle.dumps(df))
+
+        chunk_ngrams = [answer_ngrams(t) for t in texts]
+        _, retrieved = index.search(query_embeddings, max(ks))
+        recalls = {}
+        for k in ks:
+            hits = sum(
+                any(covers_answer(answer, chunk_ngrams[idx]) for idx in retrieved[i][:k] if idx >= 0)
+                for i, answer in enumerate(answers)
+            )
+            recalls[k] = hits / len(golden)
+
+        results.append({
+            '전략': label,
+            '구획 수': len(texts),
+            '평균 글자 수': round(df['text_chunk'].str.len().mean()),
+            '인덱스(KB)': round(index_bytes / 1024),
+            '데이터(KB)': round(df_bytes / 1024),
+            '구획(ms)': round(chunk_timer.ms),
+            '임베딩(ms)': round(encode_timer.ms),
+            '인덱스(ms)': round(index_timer.ms, 1),
+            **{f'recall@{k}': round(recalls[k], 3) for k in ks},
+            '프롬프트 글자 수(k=3)': round(df['text_chunk'].str.len().mean() * 3),
+        })
+    print(f"  - 질의 임베딩 평균 {query_ms:.2f}ms")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="구획 전략별 인덱스 크기/구축 시간/재현율 비교")
+    parser.add_argument('--model', default='hashing', help="'hashing'(오프라인) 또는 SentenceTransformer 모델 이름")
+    parser.add_argument('--questions', type=int, default=300)
+    args = parser.parse_args()
+
+    documents = load_history_documents()
+    golden = history_questions(documents, args.questions)
+    print(f"📊 구획 전략 벤치마크 (문서 {len(documents)}개, 질의 {len(golden)}개, 인코더: {args.model})")
+    model = load_encoder(args.model)
+    pd.set_option('display.width', 200)
+    print(pd.DataFrame(evaluate(documents, golden, model)).to_string(index=False))
@@ -0,0 +1,106 @@
+# benchmarks/bench_encoder_profiles.py
+"""
+임베딩 서빙 프로필(full / lite) 비교: 시작 시간, 최대 RSS, 전체 모델 대비 검색 재현율.
+
+프로필마다 별도 프로세스에서 인코더를 로드해 메모리를 독립적으로 측정하고,
+현재 게시된 벡터 스토어 스냅샷에서 같은 질의의 상위 k개 결과를 비교합니다.
+  - overlap@k: lite 결과 중 full 결과와 겹치는 비율
+  - recall@k: 유물명 질의('<명칭>에 대해 알려줘')에서 해당 유물을 찾은 비율
+  - 빈 질의: 경량 인코더가 아는 토큰이 없어 검색하지 않는(0 벡터) 질의 수
+
+사전 준비: python vector_store_builder.py && python static_encoder.py
+실행: python -m benchmarks.bench_encoder_profiles [--queries 200] [--k 5]
+"""
+import sys
+import json
+import argparse
+import subprocess
+import numpy as np
+import snapshot_store
+from static_encoder import load_encoder
+from benchmarks.common import peak_rss_mb, Timer
+
+PROFILES = ['full', 'lite']
+
+
+def build_queries(snapshot, n_queries: int, seed: int = 0) -> list:
+    """(저장소 이름, 질의, 정답 행 번호 목록) 목록. 유물명 질의와 역사 구획 첫 문장 질의를 섞습니다."""
+    rng = np.random.default_rng(seed)
+    df = snapshot.artifact_df
+    names = df['명칭'].astype(str).unique()
+    queries = []
+    for name in rng.choice(names, size=min(n_queries // 2, len(names)), replace=False):
+        queries.append(('artifacts', f"{name}에 대해 알려줘", np.flatnonzero(df['명칭'].astype(str) == name).tolist()))
+    history = snapshot.history_df['text_chunk'].astype(str).tolist()
+    for row in rng.choice(len(history), size=min(n_queries - len(queries), len(history)), replace=False):
+        queries.append(('history', history[row][:80], [int(row)]))
+    return queries
+
+
+def run_child(profile: str, n_queries: int, k: int):
+    """한 프로필을 로드해 측정한 결과를 JSON 한 줄로 출력합니다."""
+    with Timer() as startup:
+        model, actual_profile = load_encoder(profile)
+    encoder_rss = peak_rss_mb()
+
+    snapshot = snapshot_store.load_snapshot()
+    queries = build_queries(snapshot, n_queries)
+    indexes = {'artifacts': snapshot.artifact_index, 'history': snapshot.history_index}
+
+    results = []
+    with Timer() as encode_timer:
+        embeddings = np.asarray(model.encode([q for _, q, _ in queries]), dtype='float32')
+    for (store, _, _), embedding in zip(queries, embeddings):
+        if not np.any(embedding):
+            results.append([])  # chatbot과 같이 0 벡터 질의는 검색하지 않음
+            continue
+        _, indices = indexes[store].search(embedding[None, :], k)
+        results.append(indices[0].tolist())
+
+    print(json.dumps({
+        'profile': actual_profile,
+        'startup_s': startup.ms / 1000,
+        'rss_mb': encoder_rss,
+        'encode_ms': encode_timer.ms / len(queries),
+        'results': results,
+        'expected': [expected for _, _, expected in queries],
+        'stores': [store for store, _, _ in queries],
+    }))
+
+
+def run(n_queries: int, k: int):
+    measurements = {}
+    for profile in PROFILES:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_encoder_profiles', '--child', profile,
+             '--queries', str(n_queries), '--k', str(k)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        measurements[profile] = json.loads(output.strip().splitlines()[-1])
+
+    full = measurements['full']
+    print(f"📊 임베딩 프로필 벤치마크 (질의 {len(full['results'])}개, k={k})")
+    print(f"{'프로필':<6} {'시작(s)':>8} {'RSS(MB)':>9} {'질의(ms)':>9} {'recall@k':>9} {'overlap@k':>10} {'top1 일치':>9} {'빈 질의':>7}")
+    for profile, m in measurements.items():
+        hits = [
+            any(idx in expected for idx in result)
+            for result, expected, store in zip(m['results'], m['expected'], m['stores']) if store == 'artifacts'
+        ]
+        overlap = np.mean([len(set(a) & set(b)) / k for a, b in zip(m['results'], full['results'])])
+        top1 = np.mean([bool(a) and bool(b) and a[0] == b[0] for a, b in zip(m['results'], full['results'])])
+        empty = sum(1 for result in m['results'] if not result)
+        rss = f"{m['rss_mb']:.0f}" if m['rss_mb'] is not None else '-'
+        label = m['profile'] if m['profile'] == profile else f"{profile}→{m['profile']}"
+        print(f"{label:<6} {m['startup_s']:>8.2f} {rss:>9} {m['encode_ms']:>9.2f} {np.mean(hits):>9.3f} {overlap:>10.3f} {top1:>9.3f} {empty:>7}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="full / lite 임베딩 프로필의 시작 시간, 메모리, 재현율 비교")
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--child', choices=PROFILES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args.child, args.queries, args.k)
+    else:
+        run(args.queries, args.k)
@@ -0,0 +1,81 @@
+# benchmarks/bench_metadata_filter.py
+"""
+메타데이터 필터 검색 벤치마크: pre-filtering(IDSelectorBitmap) vs post-filtering.
+
+벡터 검색 지연 시간은 벡터 내용과 무관하므로 임베딩 모델 없이 무작위 벡터로 측정하며,
+필터 조건은 실제 유물 CSV의 시대/재질/지정구분 값을 사용합니다.
+
+실행: python -m benchmarks.bench_metadata_filter [--scale 10] [--queries 200]
+"""
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import faiss
+from metadata_index import MetadataIndex, filtered_search
+
+ARTIFACT_CSV_PATH = os.path.join('data', 'preprocessed_artifacts_final_with_images.csv')
+EMBEDDING_DIM = 1024  # upskyy/bge-m3-korean 임베딩 차원
+
+PREDICATES = [
+    {'지정구분': ['국보']},
+    {'재질': ['금'], '지정구분': ['국보']},
+    {'재질': ['금']},
+    {'재질': ['유리']},
+    {'재질': ['경질']},
+]
+
+
+def post_filtered_search(index, query_embedding, k: int, mask: np.ndarray):
+    """전체 인덱스를 검색한 뒤 필터를 적용하고, 결과가 모자라면 검색 개수를 늘려 다시 검색합니다."""
+    fetch = k
+    while True:
+        distances, indices = index.search(query_embedding, min(fetch, index.ntotal))
+        keep = mask[indices[0]]
+        if keep.sum() >= k or fetch >= index.ntotal:
+            return distances[0][keep][:k], indices[0][keep][:k]
+        fetch *= 4
+
+
+def _time_per_query(search_fn, queries) -> tuple[float, list]:
+    results = []
+    started = time.perf_counter()
+    for q in queries:
+        results.append(search_fn(q[None, :])[1])
+    return (time.perf_counter() - started) * 1000 / len(queries), results
+
+
+def run(scale: int, n_queries: int, k: int):
+    df = pd.read_csv(ARTIFACT_CSV_PATH)
+    df = pd.concat([df] * scale, ignore_index=True)
+    metadata = MetadataIndex(df)
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((len(df), EMBEDDING_DIM), dtype='float32')
+    queries = rng.standard_normal((n_queries, EMBEDDING_DIM), dtype='float32')
+    index = faiss.IndexFlatL2(EMBEDDING_DIM)
+    index.add(vectors)
+
+    print(f"📊 메타데이터 필터 검색 벤치마크 (문서 {index.ntotal}개, 질의 {n_queries}개, k={k})")
+    print(f"{'필터':<32} {'선택률':>8} {'pre(ms)':>9} {'post(ms)':>9} {'배율':>6} {'일치':>5}")
+
+    unfiltered_ms, _ = _time_per_query(lambda q: filtered_search(index, q, k), queries)
+    print(f"{'(필터 없음)':<32} {1.0:>8.3f} {unfiltered_ms:>9.3f} {unfiltered_ms:>9.3f} {1.0:>6.1f} {'-':>5}")
+
+    for predicate in PREDICATES:
+        mask = metadata.select(predicate)
+        pre_ms, pre_results = _time_per_query(lambda q: filtered_search(index, q, k, mask), queries)
+        post_ms, post_results = _time_per_query(lambda q: post_filtered_search(index, q, k, mask), queries)
+        agree = all(np.array_equal(a, b) for a, b in zip(pre_results, post_results))
+        label = str(predicate)
+        print(f"{label:<32} {mask.mean():>8.3f} {pre_ms:>9.3f} {post_ms:>9.3f} {post_ms / pre_ms:>6.1f} {'✅' if agree else '❌':>5}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="pre-filtering vs post-filtering 검색 지연 시간 비교")
+    parser.add_argument('--scale', type=int, default=10, help="유물 데이터를 몇 배로 복제해 측정할지")
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=5)
+    args = parser.parse_args()
+    run(args.scale, args.queries, args.k)
@@ -0,0 +1,148 @@
+# benchmarks/check_lite_profile.py
+"""
+경량 프로필 생성/로드 왕복 점검.
+
+실제 모델(upskyy/bge-m3-korean) 없이, SentenceTransformer와 같은 인터페이스를 가진 작은 대역 모델로
+static_encoder.build_lite_profile → StaticEmbeddingEncoder.load → encode 전체 경로를 실행하고 다음을 확인합니다.
+  - embed_token_ids가 토큰 ID를 [CLS] 토큰 [SEP] 입력으로 모델 forward에 넣고 'sentence_embedding'을 읽는지
+  - 저장한 tokenizer.json/static_embeddings.npz를 다시 로드한 인코더가 학습에 쓰지 않은 문서에서 대역 모델 임베딩을 근사하고,
+    경량 임베딩으로 대역 모델 임베딩 사이에서 검색했을 때 같은 문서를 1위로 찾는지
+  - 아는 토큰이 없는 질의가 0 벡터가 되는지, 자주 묻는 질문 벡터가 모델 임베딩과 같은지
+
+대역 모델은 토큰 임베딩 표를 평균하는 모델이므로 경량 인코더가 근사할 수 있는 상한에 가깝습니다.
+실제 모델의 검색 품질은 benchmarks.bench_encoder_profiles로 측정하세요.
+sentence_transformers와 함께 설치되는 torch가 필요합니다.
+
+실행: python -m benchmarks.check_lite_profile
+"""
+import os
+
+# 대역 토크나이저 학습 결과(어휘 순서)가 실행마다 달라지지 않도록 병렬 처리를 끕니다.
+os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from data_preprocessor import create_rag_document
+from static_encoder import StaticEmbeddingEncoder, QueryVectorTable, build_lite_profile, QUERY_VECTORS_FILE
+from benchmarks.common import HISTORY_CSV_PATH
+from benchmarks.golden_set import load_raw_artifacts
+
+SPECIAL_TOKENS = ['[UNK]', '[CLS]', '[SEP]', '[PAD]']
+MIN_MEAN_COSINE = 0.9
+MIN_TOP1_AGREEMENT = 0.85
+
+
+class StubTokenizer:
+    """transformers의 PreTrainedTokenizerFast 중 build_lite_profile이 쓰는 부분만 흉내 냅니다."""
+    def __init__(self, backend_tokenizer):
+        self.backend_tokenizer = backend_tokenizer
+        self.cls_token_id = backend_tokenizer.token_to_id('[CLS]')
+        self.sep_token_id = backend_tokenizer.token_to_id('[SEP]')
+
+    def build_inputs_with_special_tokens(self, token_ids: list) -> list:
+        return [self.cls_token_id] + list(token_ids) + [self.sep_token_id]
+
+
+class StubSentenceTransformer:
+    """
+    SentenceTransformer 대역: forward({'input_ids', 'attention_mask'})가 {'sentence_embedding': Tensor}를 반환하고,
+    encode(texts)는 특수 토큰을 붙여 같은 forward를 거친 정규화 임베딩을 반환합니다.
+    """
+    def __init__(self, backend_tokenizer, dim: int = 64, seed: int = 0):
+        self.tokenizer = StubTokenizer(backend_tokenizer)
+        self.device = 'cpu'
+        rng = np.random.default_rng(seed)
+        self.table = rng.standard_normal((backend_tokenizer.get_vocab_size(), dim)).astype('float32')
+        self.forward_calls = []
+
+    def __call__(self, features: dict) -> dict:
+        import torch
+        input_ids = features['input_ids'].cpu().numpy()
+        mask = features['attention_mask'].cpu().numpy().astype('float32')
+        self.forward_calls.append(input_ids)
+        pooled = (self.table[input_ids] * mask[:, :, None]).sum(axis=1) / mask.sum(axis=1, keepdims=True)
+        pooled /= np.linalg.norm(pooled, axis=1, keepdims=True)
+        return {'sentence_embedding': torch.from_numpy(pooled.astype('float32'))}
+
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+        import torch
+        if isinstance(texts, str):
+            texts = [texts]
+        vectors = []
+        for encoding in self.tokenizer.backend_tokenizer.encode_batch(list(texts), add_special_tokens=False):
+            input_ids = torch.tensor([self.tokenizer.build_inputs_with_special_tokens(encoding.ids)])
+            output = self({'input_ids': input_ids, 'attention_mask': torch.ones_like(input_ids)})
+            vectors.append(output['sentence_embedding'].cpu().numpy()[0])
+        return np.vstack(vectors)
+
+
+def train_tokenizer(texts: list, vocab_size: int = 4000):
+    from tokenizers import Tokenizer, models, pre_tokenizers, trainers
+    tokenizer = Tokenizer(models.WordPiece(unk_token='[UNK]'))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.train_from_iterator(texts, trainers.WordPieceTrainer(vocab_size=vocab_size, special_tokens=SPECIAL_TOKENS))
+    return tokenizer
+
+
+def load_corpus(n_documents: int, seed: int = 0) -> list:
+    artifacts = load_raw_artifacts()
+    texts = artifacts.apply(create_rag_document, axis=1).tolist()
+    texts += pd.read_csv(HISTORY_CSV_PATH)['text_chunk'].fillna('').astype(str).tolist()
+    rng = np.random.default_rng(seed)
+    return [texts[i] for i in rng.choice(len(texts), size=min(n_documents, len(texts)), replace=False)]
+
+
+def check(n_documents: int = 600) -> list:
+    """실패한 점검 항목 설명 목록을 반환합니다."""
+    corpus = load_corpus(n_documents)
+    train, held_out = corpus[:len(corpus) * 3 // 4], corpus[len(corpus) * 3 // 4:]
+    model = StubSentenceTransformer(train_tokenizer(train))
+    frequent_questions = ['석굴암에 대해 알려줘', '신라 금관의 특징은?']
+    failures = []
+
+    with tempfile.TemporaryDirectory() as profile_dir:
+        build_lite_profile(model, train, profile_dir, frequent_questions, batch_size=128)
+        encoder = StaticEmbeddingEncoder.load(profile_dir)
+        query_table = QueryVectorTable.load(f"{profile_dir}/{QUERY_VECTORS_FILE}")
+
+    # 1. 토큰 표는 [CLS] 토큰 [SEP] 입력의 sentence_embedding이어야 합니다. (배치 경계를 넘어 전체 비교)
+    tokenizer = model.tokenizer
+    inputs = np.array([tokenizer.build_inputs_with_special_tokens([int(i)]) for i in encoder.token_ids])
+    first_call = model.forward_calls[0]
+    if first_call.tolist() != inputs[:len(first_call)].tolist():
+        failures.append("embed_token_ids가 모델에 [CLS] 토큰 [SEP] 입력을 넣지 않았습니다.")
+    expected = model.table[inputs].mean(axis=1)
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    if not np.allclose(encoder.token_vectors.astype('float32'), expected, atol=1e-2):
+        failures.append("저장된 토큰 벡터가 모델 forward 결과와 다릅니다.")
+
+    # 2. 다시 로드한 경량 인코더가 학습에 쓰지 않은 문서에서도 모델 임베딩을 근사해야 합니다.
+    lite = encoder.encode(held_out)
+    full = model.encode(held_out)
+    cosine = np.sum(lite * full, axis=1) / (np.linalg.norm(lite, axis=1) * np.linalg.norm(full, axis=1) + 1e-12)
+    top1 = np.mean(np.argmax(lite @ (full / np.linalg.norm(full, axis=1, keepdims=True)).T, axis=1) == np.arange(len(held_out)))
+    print(f"  - 학습 외 문서 {len(held_out)}개: 전체 모델 대비 평균 코사인 {cosine.mean():.3f} (최소 {cosine.min():.3f}), top-1 일치 {top1:.3f}")
+    if cosine.mean() < MIN_MEAN_COSINE:
+        failures.append(f"평균 코사인 {cosine.mean():.3f} < {MIN_MEAN_COSINE}")
+    if top1 < MIN_TOP1_AGREEMENT:
+        failures.append(f"top-1 일치 {top1:.3f} < {MIN_TOP1_AGREEMENT}")
+
+    # 3. 아는 토큰이 없는 질의는 0 벡터, 자주 묻는 질문은 모델 임베딩 그대로.
+    if np.any(encoder.encode(['☃☃☃'])):
+        failures.append("아는 토큰이 없는 질의가 0 벡터가 아닙니다.")
+    for question, vector in zip(frequent_questions, model.encode(frequent_questions)):
+        cached = query_table.lookup(f" {question} ")
+        if cached is None or not np.allclose(cached, vector, atol=1e-6):
+            failures.append(f"자주 묻는 질문 벡터 불일치: '{question}'")
+    return failures
+
+
+if __name__ == '__main__':
+    print("🔄 경량 프로필 왕복 점검 시작 (대역 SentenceTransformer)...")
+    failures = check()
+    if failures:
+        print("🚨 점검 실패:\n" + '\n'.join(f"  - {f}" for f in failures))
+        sys.exit(1)
+    print("✅ build_lite_profile → StaticEmbeddingEncoder.load → encode 왕복 점검 통과.")
@@ -0,0 +1,104 @@
+# benchmarks/common.py
+"""벤치마크 스크립트들이 함께 쓰는 오프라인 인코더와 측정 도우미."""
+import os
+import re
+import time
+import zlib
+import numpy as np
+
+HISTORY_CSV_PATH = os.path.join('data', 'preprocessed_history_chunks_sectioned.csv')
+PDF_SOURCE_DIRECTORY = os.path.join('data', 'pdf_data')
+
+
+class HashingEncoder:
+    """
+    글자 n-gram을 해싱하여 고정 차원 벡터로 만드는 오프라인 인코더.
+    임베딩 모델을 내려받을 수 없는 환경에서 구획/인덱스 변경의 상대 비교용으로 사용합니다.
+    SentenceTransformer.encode와 같은 형태로 호출할 수 있습니다.
+    """
+    def __init__(self, dim: int = 2048, ngram_range: tuple = (2, 3)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    def _encode_one(self, text: str) -> np.ndarray:
+        compact = re.sub(r'\s+', ' ', str(text)).strip()
+        vector = np.zeros(self.dim, dtype='float32')
+        for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+            for i in range(len(compact) - n + 1):
+                vector[zlib.crc32(compact[i:i + n].encode('utf-8')) % self.dim] += 1.0
+        vector = np.log1p(vector)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            texts = [texts]
+        return np.vstack([self._encode_one(t) for t in texts]) if texts else np.zeros((0, self.dim), dtype='float32')
+
+
+def load_encoder(name: str):
+    """
+    벤치마크용 인코더를 로드합니다.
+      - 'hashing': 오프라인 해싱 인코더
+      - 'lite': static_encoder.py로 만든 경량 프로필
+      - 'full': config.EMBEDDING_MODEL
+      - 그 외: 해당 이름의 SentenceTransformer 모델
+    """
+    if name == 'hashing':
+        return HashingEncoder()
+    if name == 'lite':
+        import config
+        from static_encoder import StaticEmbeddingEncoder
+        return StaticEmbeddingEncoder.load(config.LITE_PROFILE_DIR)
+    if name == 'full':
+        import config
+        name = config.EMBEDDING_MODEL
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name)
+
+
+def encode(model, texts: list) -> np.ndarray:
+    return np.asarray(model.encode(texts), dtype='float32')
+
+
+def load_history_documents() -> dict:
+    """
+    파일명 → (페이지 번호, 텍스트) 목록을 반환합니다.
+    원본 PDF가 있으면 페이지를 직접 추출하고, 없으면 저장소에 포함된 구획 CSV의 각 행을 한 페이지로 간주합니다.
+    """
+    if os.path.isdir(PDF_SOURCE_DIRECTORY):
+        try:
+            from pdf_processor import extract_pages
+            pdf_files = sorted(f for f in os.listdir(PDF_SOURCE_DIRECTORY) if f.lower().endswith('.pdf'))
+            if pdf_files:
+                return {f: extract_pages(os.path.join(PDF_SOURCE_DIRECTORY, f)) for f in pdf_files}
+        except ImportError:
+            pass
+
+    import pandas as pd
+    df = pd.read_csv(HISTORY_CSV_PATH)
+    documents = {}
+    for source_file, group in df.groupby('source_file', sort=False):
+        documents[source_file] = [(i + 1, str(text)) for i, text in enumerate(group['text_chunk'])]
+    return documents
+
+
+def peak_rss_mb() -> float | None:
+    """현재 프로세스의 최대 상주 메모리(RSS, MB). resource 모듈이 없는 환경(Windows)에서는 None."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    import sys
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+class Timer:
+    """with 블록의 실행 시간을 ms 단위로 기록합니다."""
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.ms = (time.perf_counter() - self.started) * 1000
@@ -0,0 +1,171 @@
+# benchmarks/golden_set.py
+"""
+저장소에 포함된 데이터로 '질문 → 정답 문서' 골든 세트를 만듭니다.
+
+  - 유물(artifacts): 유물명 질문과 주요 특징 문장 질문. 정답은 유물 'id' 목록이므로 문서 서식이 바뀌어도 유지됩니다.
+    유물 원본 행은 benchmarks/fixtures/artifacts_raw.csv에 있으며, 벤치마크는 이 행에
+    data_preprocessor.create_rag_document를 적용해 유물 문서를 만듭니다.
+  - 역사(history): 구획/상용구 제거 전의 원본 페이지에서 뽑은 문장. 질문은 문장의 일부만 남기고 조사/어미를
+    떼어 내 원문과 글자 그대로 일치하지 않게 만들고, 정답 문장의 글자 n-gram 대부분을 포함한 구획을 정답으로 봅니다.
+    구획 단계가 본문을 잘못 버리면 해당 질문은 정답을 찾을 수 없어 재현율이 내려갑니다.
+
+실행: python -m benchmarks.golden_set  (benchmarks/golden_set.json 재생성)
+"""
+import os
+import re
+import json
+import random
+import pandas as pd
+from chunking import split_sentences
+from benchmarks.common import load_history_documents
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ARTIFACT_CSV_PATH = os.path.join('data', 'preprocessed_artifacts_final_with_images.csv')
+RAW_ARTIFACT_FIXTURE_PATH = os.path.join(BENCHMARK_DIR, 'fixtures', 'artifacts_raw.csv')
+GOLDEN_SET_PATH = os.path.join(BENCHMARK_DIR, 'golden_set.json')
+
+RAW_ARTIFACT_COLUMNS = ['id', '명칭', '국적/시대1', '재질1', '지정구분', '특징', '신보고서 종합편 설명 내용', '참고자료']
+RAG_DOCUMENT_PATTERN = re.compile(
+    r'^\[유물명\]: (.*?) \[시대\]: (.*?) \[재질\]: (.*?) \[지정 정보\]: (.*?) '
+    r'\[주요 특징\]: (.*?) \[상세 설명\]: (.*?) \[참고 자료\]: (.*)$', re.S
+)
+# 어절 끝의 조사/어미. 질문을 원문과 다르게 만들기 위해 떼어 냅니다.
+KOREAN_SUFFIX = re.compile(r'(?<=[가-힣])(?:에서|으로|에게|까지|부터|하였다|되었다|이다|였다|했다|한다|은|는|이|가|을|를|의|에|로|와|과|도)$')
+ANSWER_NGRAM = 5
+MIN_ANSWER_COVERAGE = 0.8
+
+
+def compact(text: str) -> str:
+    """공백 차이를 무시하고 문장 포함 여부를 비교하기 위한 형태."""
+    return re.sub(r'\s+', '', str(text))
+
+
+def answer_ngrams(text: str) -> set:
+    compacted = compact(text)
+    return {compacted[i:i + ANSWER_NGRAM] for i in range(max(1, len(compacted) - ANSWER_NGRAM + 1))}
+
+
+def covers_answer(answer: set, chunk: set, min_coverage: float = MIN_ANSWER_COVERAGE) -> bool:
+    """
+    구획이 정답 문장의 글자 n-gram을 min_coverage 이상 포함하는지 확인합니다.
+    머리글/쪽 번호 제거나 페이지 경계 처리로 문장 일부가 달라져도 같은 문장으로 봅니다.
+    """
+    return bool(answer) and len(answer & chunk) / len(answer) >= min_coverage
+
+
+def paraphrase(sentence: str, rng: random.Random) -> str:
+    """
+    문장의 절반 정도만 남기고 조사/어미와 문장부호를 떼어 낸 짧은 질의를 만듭니다.
+    띄어쓰기가 거의 없는 중국어/일본어 문장은 글자 단위로 40% 구간만 남깁니다.
+    """
+    words = sentence.split()
+    if len(words) >= 6:
+        size = max(3, len(words) // 2)
+        start = rng.randrange(len(words) - size + 1)
+        window = [KOREAN_SUFFIX.sub('', w.strip('.,;:!?"\'“”‘’()[]「」『』')) for w in words[start:start + size]]
+        return ' '.join(w for w in window if w)
+    size = max(12, int(len(sentence) * 0.4))
+    start = rng.randrange(max(1, len(sentence) - size + 1))
+    return sentence[start:start + size].strip()
+
+
+def parse_rag_document(document: str) -> dict | None:
+    """create_rag_document가 만든 문서를 원본 컬럼으로 되돌립니다. (원본 행 fixture 생성용)"""
+    match = RAG_DOCUMENT_PATTERN.match(str(document))
+    return dict(zip(RAW_ARTIFACT_COLUMNS[1:], match.groups())) if match else None
+
+
+def build_artifact_fixture(path: str = RAW_ARTIFACT_FIXTURE_PATH):
+    """
+    원본 유물 CSV(data/converted_검증완료_통합.csv)는 저장소에 없으므로, 전처리 결과의 rag_document를 원본 컬럼으로
+    분해한 행을 fixture로 저장합니다. 분해한 행으로 문서를 다시 만들었을 때 원래 문서와 같은지 확인합니다.
+    """
+    from data_preprocessor import create_rag_document
+    df = pd.read_csv(ARTIFACT_CSV_PATH)
+    rows = []
+    for artifact_id, document in zip(df['id'], df['rag_document']):
+        row = parse_rag_document(document)
+        if row is None or create_rag_document(row) != document:
+            raise ValueError(f"유물 '{artifact_id}'의 문서를 원본 컬럼으로 되돌릴 수 없습니다.")
+        rows.append({'id': artifact_id, **row})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame(rows, columns=RAW_ARTIFACT_COLUMNS).to_csv(path, index=False, encoding='utf-8')
+
+
+def load_raw_artifacts(path: str = RAW_ARTIFACT_FIXTURE_PATH) -> pd.DataFrame:
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def artifact_questions(df: pd.DataFrame, n_questions: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    names = sorted(df['명칭'].astype(str).unique())
+    rng.shuffle(names)
+
+    questions = []
+    for name in names[:n_questions // 2]:
+        questions.append({
+            'store': 'artifacts', 'type': 'name',
+            'question': f"{name}에 대해 알려줘",
+            'expected_ids': df.loc[df['명칭'].astype(str) == name, 'id'].astype(str).tolist(),
+        })
+
+    feature_rows = list(range(len(df)))
+    rng.shuffle(feature_rows)
+    features = df['특징'].astype(str)
+    for row in feature_rows:
+        if len(questions) >= n_questions:
+            break
+        sentences = [s for s in split_sentences(features.iloc[row]) if 30 <= len(s) <= 200]
+        if not sentences:
+            continue
+        sentence = sentences[0]
+        questions.append({
+            'store': 'artifacts', 'type': 'feature',
+            'question': paraphrase(sentence, rng),
+            'expected_ids': df.loc[features.str.contains(sentence, regex=False), 'id'].astype(str).tolist(),
+        })
+    return questions
+
+
+def history_questions(documents: dict, n_questions: int, seed: int = 0) -> list:
+    """상용구 제거/구획 전의 원본 페이지 문장에서 질문을 뽑습니다. (숫자·기호 위주의 조각은 제외)"""
+    rng = random.Random(seed)
+    candidates = []
+    for source_file, pages in documents.items():
+        for page_no, text in pages:
+            for sentence in split_sentences(text):
+                letters = sum(ch.isalpha() for ch in sentence)
+                if 40 <= len(sentence) <= 300 and letters >= len(sentence) * 0.6:
+                    candidates.append((source_file, page_no, sentence))
+    rng.shuffle(candidates)
+    return [
+        {'store': 'history', 'type': 'sentence', 'question': paraphrase(sentence, rng),
+         'answer_text': sentence, 'source_file': source_file, 'page': page_no}
+        for source_file, page_no, sentence in candidates[:n_questions]
+    ]
+
+
+def build_golden_set(n_artifact: int = 200, n_history: int = 200, seed: int = 0) -> list:
+    questions = (
+        artifact_questions(load_raw_artifacts(), n_artifact, seed)
+        + history_questions(load_history_documents(), n_history, seed)
+    )
+    for i, question in enumerate(questions):
+        question['qid'] = f"{question['store']}-{i:04d}"
+    return questions
+
+
+def load_golden_set(path: str = GOLDEN_SET_PATH) -> list:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+if __name__ == '__main__':
+    if not os.path.exists(RAW_ARTIFACT_FIXTURE_PATH):
+        build_artifact_fixture()
+        print(f"✅ 유물 원본 행 fixture 저장 완료: '{RAW_ARTIFACT_FIXTURE_PATH}'")
+    golden = build_golden_set()
+    with open(GOLDEN_SET_PATH, 'w', encoding='utf-8') as f:
+        json.dump(golden, f, ensure_ascii=False, indent=1)
+    counts = pd.Series([q['store'] for q in golden]).value_counts().to_dict()
+    print(f"✅ 골든 세트 {len(golden)}개 질문 저장 완료: '{GOLDEN_SET_PATH}' {counts}")
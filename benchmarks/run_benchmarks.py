@@ -0,0 +1,251 @@
+# benchmarks/run_benchmarks.py
+"""
+RAG 검색 품질/성능 회귀 벤치마크.
+
+현재 코드(data_preprocessor.create_rag_document, chunking, vector_store_builder.build_index)로
+유물 원본 행 fixture(benchmarks/fixtures/artifacts_raw.csv)와 역사 문서에서 벡터 스토어를 메모리에서 다시 만들고, 골든 세트(benchmarks/golden_set.json)로 다음을 측정합니다.
+  - 품질: recall@1, recall@5, MRR@10
+  - 성능: 질의 인코딩/검색 지연(p50, p95), 인덱스 구축 시간(임베딩 포함), 인덱스 크기, 최대 RSS
+
+측정값은 benchmarks/baseline.json에 인코더별로 저장된 기준값과 비교하며,
+benchmarks/thresholds.json의 허용 범위를 벗어나면 종료 코드 1로 끝납니다.
+기본 인코더('hashing')는 모델 다운로드 없이 동작하므로 완전히 오프라인으로 실행됩니다.
+시간/메모리 지표는 기계와 부하에 따라 크게 달라지므로 --timing을 줄 때만, 그리고 기준값을 저장한
+기계(host 지문)와 같은 기계에서만 비교합니다. 기본 실행은 품질 지표와 인덱스 크기만 판정합니다.
+
+실행:
+  python -m benchmarks.run_benchmarks                    # 기준값과 비교
+  python -m benchmarks.run_benchmarks --timing           # 같은 기계에서 시간/메모리 지표까지 비교
+  python -m benchmarks.run_benchmarks --update-baseline  # 현재 결과를 기준값으로 저장
+  python -m benchmarks.run_benchmarks --encoder lite     # 경량 프로필(static_encoder.py 실행 필요)
+"""
+import os
+
+# 모델 허브에 접속하지 않도록 합니다. (로컬 캐시에 있는 모델만 사용)
+os.environ.setdefault('HF_HUB_OFFLINE', '1')
+
+import sys
+import json
+import fnmatch
+import platform
+import argparse
+import numpy as np
+import pandas as pd
+import faiss
+import config
+from chunking import get_chunker, chunk_documents
+from data_preprocessor import create_rag_document
+from vector_store_builder import build_index
+from benchmarks.common import load_encoder, encode, load_history_documents, peak_rss_mb, Timer
+from benchmarks.golden_set import load_raw_artifacts, load_golden_set, answer_ngrams, covers_answer
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+THRESHOLDS_PATH = os.path.join(BENCHMARK_DIR, 'thresholds.json')
+SEARCH_K = 10
+MACHINE_DEPENDENT_PATTERNS = ('*_ms_*', 'build_s', 'peak_rss_mb')
+
+
+def host_fingerprint() -> str:
+    """시간/메모리 기준값을 잰 기계를 구분하기 위한 문자열 (CPU 모델, 코어 수, OS, 파이썬 버전)."""
+    cpu = platform.processor()
+    try:
+        with open('/proc/cpuinfo', 'r') as f:
+            cpu = next((line.split(':', 1)[1].strip() for line in f if line.startswith('model name')), cpu)
+    except OSError:
+        pass
+    return f"{cpu} x{os.cpu_count()} / {platform.system()} {platform.machine()} / Python {platform.python_version()}"
+
+
+def load_artifact_corpus() -> pd.DataFrame:
+    """저장소에 포함된 유물 원본 행(benchmarks/fixtures)에 현재 create_rag_document를 적용해 문서를 만듭니다."""
+    df = load_raw_artifacts()
+    df['rag_document'] = df.apply(create_rag_document, axis=1)
+    return df
+
+
+def load_history_corpus() -> pd.DataFrame:
+    """pdf_processor와 같은 설정(config.CHUNK_*)으로 역사 문서를 구획합니다."""
+    chunker = get_chunker(
+        config.CHUNK_STRATEGY,
+        target_size=config.CHUNK_TARGET_SIZE, overlap=config.CHUNK_OVERLAP, min_length=config.CHUNK_MIN_LENGTH,
+    )
+    rows = chunk_documents(load_history_documents(), chunker, dedupe_threshold=config.CHUNK_DEDUPE_THRESHOLD)
+    return pd.DataFrame(rows)
+
+
+def artifact_relevance(df: pd.DataFrame):
+    ids = df['id'].astype(str).tolist()
+    return lambda question, row: ids[row] in question['expected_ids']
+
+
+def history_relevance(df: pd.DataFrame):
+    """정답 문장의 글자 n-gram 대부분을 포함한 구획을 정답으로 봅니다. (검색된 구획만 n-gram을 계산)"""
+    texts = df['text_chunk'].astype(str).tolist()
+    chunk_cache, answer_cache = {}, {}
+
+    def is_relevant(question, row):
+        if row not in chunk_cache:
+            chunk_cache[row] = answer_ngrams(texts[row])
+        if question['qid'] not in answer_cache:
+            answer_cache[question['qid']] = answer_ngrams(question['answer_text'])
+        return covers_answer(answer_cache[question['qid']], chunk_cache[row])
+    return is_relevant
+
+
+def percentile(values: list, q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def evaluate_store(model, texts: list, questions: list, is_relevant) -> dict:
+    """한 저장소의 인덱스를 구축하고 골든 질문마다 인코딩/검색 시간과 첫 정답 순위를 측정합니다."""
+    with Timer() as build_timer:
+        index = build_index(encode(model, texts))
+
+    encode_ms, search_ms, ranks = [], [], []
+    for question in questions:
+        with Timer() as encode_timer:
+            query_vector = encode(model, [question['question']])
+        with Timer() as search_timer:
+            _, indices = index.search(query_vector, SEARCH_K)
+        encode_ms.append(encode_timer.ms)
+        search_ms.append(search_timer.ms)
+        rank = next((r for r, row in enumerate(indices[0], 1) if row >= 0 and is_relevant(question, int(row))), None)
+        ranks.append(rank)
+
+    def recall(k):
+        return float(np.mean([rank is not None and rank <= k for rank in ranks]))
+
+    return {
+        'documents': len(texts),
+        'questions': len(questions),
+        'recall@1': recall(1),
+        'recall@5': recall(5),
+        f'mrr@{SEARCH_K}': float(np.mean([1 / rank if rank else 0.0 for rank in ranks])),
+        'encode_ms_p50': percentile(encode_ms, 50),
+        'encode_ms_p95': percentile(encode_ms, 95),
+        'search_ms_p50': percentile(search_ms, 50),
+        'search_ms_p95': percentile(search_ms, 95),
+        'build_s': build_timer.ms / 1000,
+        'index_mb': faiss.serialize_index(index).nbytes / (1024 * 1024),
+    }
+
+
+def run(encoder_name: str, golden_path: str) -> dict:
+    golden = load_golden_set(golden_path)
+    print(f"🔄 검색 벤치마크 시작 (인코더 '{encoder_name}', 골든 질문 {len(golden)}개)...")
+    model = load_encoder(encoder_name)
+
+    corpora = {}
+    artifact_df = load_artifact_corpus()
+    corpora['artifacts'] = (artifact_df['rag_document'].tolist(), artifact_relevance(artifact_df))
+    history_df = load_history_corpus()
+    corpora['history'] = (history_df['text_chunk'].astype(str).tolist(), history_relevance(history_df))
+
+    stores = {}
+    for store, (texts, is_relevant) in corpora.items():
+        questions = [q for q in golden if q['store'] == store]
+        print(f"  - '{store}' 평가 중 (문서 {len(texts)}개, 질문 {len(questions)}개)...")
+        stores[store] = evaluate_store(model, texts, questions, is_relevant)
+    return {'encoder': encoder_name, 'peak_rss_mb': peak_rss_mb(), 'stores': stores}
+
+
+def flatten(results: dict) -> dict:
+    """비교를 위해 {'artifacts.recall@1': 0.9, ..., 'peak_rss_mb': 300} 형태로 펼칩니다."""
+    flat = {f"{store}.{metric}": value for store, metrics in results['stores'].items() for metric, value in metrics.items()}
+    if results.get('peak_rss_mb') is not None:
+        flat['peak_rss_mb'] = results['peak_rss_mb']
+    return flat
+
+
+def find_rule(metric: str, thresholds: dict) -> dict | None:
+    name = metric.split('.')[-1]
+    return next((rule for pattern, rule in thresholds.items() if fnmatch.fnmatch(name, pattern)), None)
+
+
+def compare(current: dict, baseline: dict, thresholds: dict, check_timing: bool = False) -> list:
+    """
+    (지표, 기준값, 현재값, 판정) 목록을 반환합니다.
+      - max_drop: 기준값보다 이 값 이상 낮아지면 실패 (품질 지표)
+      - max_increase_ratio: 기준값의 (1 + 이 값)배를 넘으면 실패 (시간/메모리 지표)
+      - min_increase: 증가량이 이 값 이하이면 비율과 관계없이 통과 (1ms 미만 지표의 측정 잡음 무시)
+    check_timing이 False이면 기계에 따라 달라지는 지표(MACHINE_DEPENDENT_PATTERNS)는 'skip'으로 표시합니다.
+    """
+    rows = []
+    for metric, value in current.items():
+        base = baseline.get(metric)
+        rule = find_rule(metric, thresholds)
+        if base is None or rule is None:
+            status = '-'
+        elif not check_timing and any(fnmatch.fnmatch(metric.split('.')[-1], p) for p in MACHINE_DEPENDENT_PATTERNS):
+            status = 'skip'
+        elif 'max_drop' in rule and value < base - rule['max_drop']:
+            status = 'FAIL'
+        elif ('max_increase_ratio' in rule and value > base * (1 + rule['max_increase_ratio'])
+              and value - base > rule.get('min_increase', 0)):
+            status = 'FAIL'
+        else:
+            status = 'ok'
+        rows.append((metric, base, value, status))
+    return rows
+
+
+def format_value(value) -> str:
+    if value is None:
+        return '-'
+    return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+
+def load_json(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="골든 세트 기반 검색 품질/성능 회귀 벤치마크")
+    parser.add_argument('--encoder', default='hashing', help="hashing | lite | full | SentenceTransformer 모델 이름")
+    parser.add_argument('--golden', default=None, help="골든 세트 JSON 경로 (기본: benchmarks/golden_set.json)")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--thresholds', default=THRESHOLDS_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help="현재 결과를 이 인코더의 기준값으로 저장")
+    parser.add_argument('--timing', action='store_true', help="시간/메모리 지표도 비교 (기준값을 저장한 기계에서만 적용)")
+    parser.add_argument('--output', help="측정 결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    results = run(args.encoder, args.golden or os.path.join(BENCHMARK_DIR, 'golden_set.json'))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    baselines = load_json(args.baseline)
+    if args.update_baseline:
+        baselines[args.encoder] = {'host': host_fingerprint(), **flatten(results)}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2)
+        print(f"✅ '{args.encoder}' 기준값 저장 완료: '{args.baseline}'")
+
+    baseline = baselines.get(args.encoder, {})
+    check_timing = args.timing and baseline.get('host') == host_fingerprint()
+    if args.timing and not check_timing:
+        print(f"\n⚠️ 기준값을 잰 기계('{baseline.get('host')}')와 현재 기계('{host_fingerprint()}')가 달라 시간/메모리 지표는 비교하지 않습니다.")
+    rows = compare(flatten(results), baseline, load_json(args.thresholds), check_timing)
+    print(f"\n📊 검색 벤치마크 결과 (인코더 '{args.encoder}')")
+    print(f"{'지표':<28} {'기준값':>10} {'현재값':>10} {'판정':>6}")
+    for metric, base, value, status in rows:
+        print(f"{metric:<28} {format_value(base):>10} {format_value(value):>10} {status:>6}")
+
+    if args.encoder not in baselines:
+        print(f"\n⚠️ '{args.encoder}' 인코더의 기준값이 없습니다. --update-baseline으로 먼저 저장하세요.")
+        return 0
+    failures = [metric for metric, _, _, status in rows if status == 'FAIL']
+    if failures:
+        print(f"\n🚨 회귀 감지: {', '.join(failures)}")
+        return 1
+    print("\n✅ 모든 지표가 허용 범위 안에 있습니다.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
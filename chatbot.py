@@ -1,13 +1,15 @@
 # chatbot.py
 import os
-import faiss
-import pickle
+import time
+import threading
 import google.generativeai as genai
-from sentence_transformers import SentenceTransformer
 import config
 import numpy as np
 import json
 from dotenv import load_dotenv
+from metadata_index import FILTER_FIELDS, filtered_search
+import snapshot_store
+from static_encoder import load_encoder, QueryVectorTable, QUERY_VECTORS_FILE
 
 class RAGChatbot:
     _instance = None
@@ -20,9 +22,16 @@ class RAGChatbot:
         if hasattr(self, '_initialized'): return
         load_dotenv()
         print("⏳ 챗봇 초기화 시작...")
-        self.model = SentenceTransformer(config.EMBEDDING_MODEL)
-        self.artifact_index, self.artifact_df = self._load_vector_store('artifacts', config.ARTIFACT_INDEX_PATH, config.ARTIFACT_DF_PATH)
-        self.history_index, self.history_df = self._load_vector_store('history', config.HISTORY_INDEX_PATH, config.HISTORY_DF_PATH)
+        # 메모리가 부족하거나 전체 모델 로드에 실패하면 경량 인코더('lite')로 동작합니다.
+        self.model, self.embedding_profile = load_encoder(config.EMBEDDING_PROFILE)
+        self.query_vectors = QueryVectorTable.load(os.path.join(config.LITE_PROFILE_DIR, QUERY_VECTORS_FILE))
+        print(f"  - 임베딩 프로필: '{self.embedding_profile}', 미리 계산된 질문 벡터 {len(self.query_vectors)}개.")
+        # 요청은 시작 시점의 self.snapshot을 끝까지 사용하므로, 교체는 참조 하나만 바꾸면 됩니다.
+        self.snapshot = snapshot_store.load_snapshot()
+        self.previous_snapshot_version = None
+        self._failed_snapshot_version = None  # 자동 교체에 실패한 버전 (CURRENT가 바뀔 때까지 재시도하지 않음)
+        self._swap_lock = threading.Lock()
+        print(f"  - 벡터 스토어 스냅샷 '{self.snapshot.version}' 사용.")
         try:
             api_key = os.getenv("GEMINI_API_KEY")
             if not api_key: raise ValueError("API 키가 .env에 없습니다.")
@@ -32,17 +41,89 @@ class RAGChatbot:
         except Exception as e:
             self.llm_model = None
             print(f"  - 🚨 경고: Gemini 모델 로드 실패 - {e}")
+        if config.SNAPSHOT_POLL_INTERVAL > 0:
+            threading.Thread(target=self._watch_snapshots, name="snapshot-watcher", daemon=True).start()
         self._initialized = True
         print("✅ 챗봇 초기화 완료.")
 
-    def _load_vector_store(self, store_name, index_path, df_path):
-        if not os.path.exists(index_path) or not os.path.exists(df_path):
-            raise FileNotFoundError(f"'{store_name}'의 벡터 스토어 파일이 없습니다.")
-        print(f"  - '{store_name}' 벡터 스토어 로딩...")
-        index = faiss.read_index(index_path)
-        with open(df_path, 'rb') as f:
-            df = pickle.load(f)
-        return index, df
+    # --- 벡터 스토어 스냅샷 교체 ---
+    def _watch_snapshots(self):
+        """
+        CURRENT 포인터를 주기적으로 확인하여 새로 게시된 스냅샷으로 백그라운드에서 교체합니다.
+        검증이나 로드에 실패한 버전은 기록해 두고, CURRENT가 다른 버전으로 바뀔 때까지 다시 시도하지 않습니다.
+        """
+        while True:
+            time.sleep(config.SNAPSHOT_POLL_INTERVAL)
+            current = None
+            try:
+                current = snapshot_store.read_current()
+                if current and current != self.snapshot.version and current != self._failed_snapshot_version:
+                    self._follow_current(current)
+            except Exception as e:
+                self._failed_snapshot_version = current
+                print(f"🚨 스냅샷 '{current}' 자동 교체 실패 (CURRENT가 바뀔 때까지 재시도하지 않음): {e}")
+
+    def _follow_current(self, version: str):
+        """
+        감시 스레드용 교체. 잠금을 잡은 뒤 CURRENT를 다시 읽어, 그사이 관리자 교체/롤백으로 바뀌었으면 건너뜁니다.
+        감시 스레드는 CURRENT를 따라가기만 하고 절대 쓰지 않습니다.
+        """
+        with self._swap_lock:
+            if snapshot_store.read_current() != version:
+                return
+            self._swap_locked(version, publish=False)
+
+    def swap_snapshot(self, version: str | None = None) -> dict:
+        """
+        지정한(없으면 현재 게시된) 스냅샷을 로드하여 교체합니다.
+        새 스냅샷을 모두 로드하고 검증한 뒤에 참조를 바꾸므로, 진행 중인 요청은 이전 스냅샷으로 끝까지 처리됩니다.
+        지정한 버전이 게시된 버전과 다르면 CURRENT도 함께 바꿔, 감시 스레드가 다시 되돌리지 않도록 합니다.
+        """
+        with self._swap_lock:
+            return self._swap_locked(version or snapshot_store.read_current())
+
+    def _swap_locked(self, version: str | None, publish: bool = True) -> dict:
+        """
+        _swap_lock을 잡은 상태에서 호출합니다.
+        publish가 True(관리자 교체/롤백)일 때만 CURRENT를 이 버전으로 바꿉니다.
+        """
+        if version is None or version == self.snapshot.version:
+            return self.snapshot_status()
+        new_snapshot = snapshot_store.load_snapshot(version)
+        model = new_snapshot.manifest.get('embedding_model')
+        if model and model != config.EMBEDDING_MODEL:
+            raise ValueError(f"스냅샷 '{version}'은 다른 임베딩 모델({model})로 구축되었습니다.")
+        if publish and snapshot_store.read_current() != version:
+            snapshot_store.set_current(version)
+        self.previous_snapshot_version = self.snapshot.version
+        self.snapshot = new_snapshot
+        self._failed_snapshot_version = None
+        print(f"🔁 벡터 스토어 스냅샷 교체: '{self.previous_snapshot_version}' → '{version}'")
+        return self.snapshot_status()
+
+    def rollback_snapshot(self) -> dict:
+        """직전 스냅샷(없으면 현재보다 한 단계 오래된 스냅샷)으로 되돌립니다."""
+        with self._swap_lock:
+            # 동시에 들어온 교체/롤백 요청과 대상이 엇갈리지 않도록 대상 선택도 잠금 안에서 합니다.
+            versions = snapshot_store.list_snapshots()
+            target = self.previous_snapshot_version
+            if target not in versions:
+                older = [v for v in versions if v < self.snapshot.version]
+                target = older[-1] if older else None
+            if target is None:
+                raise ValueError("롤백할 이전 스냅샷이 없습니다.")
+            return self._swap_locked(target)
+
+    def snapshot_status(self) -> dict:
+        manifest = self.snapshot.manifest
+        return {
+            "loaded": self.snapshot.version,
+            "published": snapshot_store.read_current(),
+            "previous": self.previous_snapshot_version,
+            "available": snapshot_store.list_snapshots(),
+            "embedding_model": manifest.get('embedding_model'),
+            "stores": {name: {k: v for k, v in store.items() if k != 'files'} for name, store in manifest.get('stores', {}).items()},
+        }
 
     # (⭐ 핵심 추가 1) 질문 재구성 함수
     def _rewrite_query_with_history(self, query: str, chat_history: list):        
@@ -82,43 +163,85 @@ class RAGChatbot:
             return query
 
     
-    def _semantic_route_query(self, query: str): # (⭐ 수정) 이제 대화 기록이 필요 없음
+    def _semantic_route_query(self, query: str, snapshot): # (⭐ 수정) 이제 대화 기록이 필요 없음
+        filter_hints = "\n".join(
+            f"- \"{name}\": {', '.join(snapshot.artifact_metadata.values(name))}" for name in FILTER_FIELDS
+        )
         routing_prompt = f"""당신은 사용자의 질문 의도를 분석하는 라우팅 전문가입니다.
 [사용자 질문]을 보고, 의도를 아래 [질문 유형] 중 하나로 분류하여 JSON 형식으로만 답변해주세요.
+질문에 유물의 재질, 시대, 지정구분(국보 등) 조건이 있으면 [필터 값] 중에서 골라 "filters"에 담아주세요. 조건이 없으면 빈 객체로 두세요.
 
 [질문 유형]
 - "유물_상세정보": 특정 유물 하나에 대한 상세 정보(모양, 재질, 출토 위치 등)를 묻는 질문.
+- "유물_목록": 재질, 시대, 지정구분 등의 조건에 맞는 여러 유물을 찾는 질문.
 - "역사_배경": 특정 시대, 사건, 기술, 문화 등 포괄적인 역사적 배경이나 지식을 묻는 질문.
 - "유물_비교": 두 개 이상의 유물을 비교해달라는 질문.
 - "단순_대화": 정보 검색이 필요 없는 일반적인 대화 (인사, 감사 등).
 
+[필터 값]
+{filter_hints}
+
 [사용자 질문]
 "{query}"
 
 [분석 결과 (JSON 형식)]
 """
         try:
-            response = self.llm_model.generate_content(f'{routing_prompt}\n{{\n  "classification": "...",\n  "reason": "..."\n}}')
+            response = self.llm_model.generate_content(f'{routing_prompt}\n{{\n  "classification": "...",\n  "filters": {{"재질": ["..."]}},\n  "reason": "..."\n}}')
             json_text = response.text.strip().replace('```json', '').replace('```', '').strip()
             route_result = json.loads(json_text)
             classification = route_result.get("classification", "역사_배경")
-            print(f"  🧠 시맨틱 라우터: '{classification}'으로 분류. (이유: {route_result.get('reason')})")
-            return classification
+            filters = self._normalize_filters(route_result.get("filters"))
+            print(f"  🧠 시맨틱 라우터: '{classification}'으로 분류, 필터: {filters or '없음'}. (이유: {route_result.get('reason')})")
+            return classification, filters
         except Exception as e:
             print(f"🚨 라우팅 중 오류 발생: {e}. '역사_배경'으로 기본 설정합니다.")
-            return "역사_배경"
-
-    def _search(self, query: str, route: str, k: int = 3):
-        query_embedding = self.model.encode([query])
-        if route == "유물_상세정보":
-            distances, indices = self.artifact_index.search(query_embedding, 1)
-            return [self.artifact_df.iloc[idx].to_dict() for idx in indices[0]]
-        elif route == "유물_비교":
-            distances, indices = self.artifact_index.search(query_embedding, k)
-            return [self.artifact_df.iloc[idx].to_dict() for idx in indices[0]]
+            return "역사_배경", {}
+
+    def _normalize_filters(self, filters) -> dict:
+        """라우터가 만든 필터에서 알 수 없는 필드와 빈 값을 제거하고, 값은 항상 리스트로 맞춥니다."""
+        if not isinstance(filters, dict):
+            return {}
+        normalized = {}
+        for name, values in filters.items():
+            if name not in FILTER_FIELDS or not values:
+                continue
+            if not isinstance(values, list):
+                values = [values]
+            values = [str(v).strip() for v in values if str(v).strip()]
+            if values:
+                normalized[name] = values
+        return normalized
+
+    def _encode_query(self, query: str):
+        """
+        자주 묻는 질문이면 미리 계산된 벡터를, 아니면 현재 인코더로 임베딩합니다.
+        경량 인코더가 아는 토큰이 하나도 없어 0 벡터가 나오면 None을 반환합니다.
+        """
+        vector = self.query_vectors.lookup(query)
+        if vector is not None:
+            return vector[None, :]
+        embedding = np.asarray(self.model.encode([query]), dtype='float32')
+        return embedding if np.any(embedding) else None
+
+    def _search(self, query: str, route: str, snapshot, k: int = 3, filters: dict | None = None):
+        query_embedding = self._encode_query(query)
+        if query_embedding is None:
+            # 0 벡터로 검색하면 질문과 무관한 문서가 반환되므로 참고 자료 없이 답변합니다.
+            print(f"  ⚠️ '{self.embedding_profile}' 인코더가 질문의 토큰을 하나도 알지 못해 검색을 건너뜁니다.")
+            return []
+        if route in ("유물_상세정보", "유물_비교", "유물_목록"):
+            k = {"유물_상세정보": 1, "유물_목록": 5}.get(route, k)
+            # 구조화 필터가 있으면 조건에 맞는 유물만 대상으로 검색(pre-filtering)
+            mask = snapshot.artifact_metadata.select(filters)
+            if mask is not None and not mask.any():
+                print(f"  ⚠️ 필터 {filters}에 맞는 유물이 없어 전체 유물에서 검색합니다.")
+                mask = None
+            distances, indices = filtered_search(snapshot.artifact_index, query_embedding, k, mask)
+            return [snapshot.artifact_df.iloc[idx].to_dict() for idx in indices]
         elif route == "역사_배경":
-            distances, indices = self.history_index.search(query_embedding, k)
-            return [self.history_df.iloc[idx].to_dict() for idx in indices[0]]
+            distances, indices = snapshot.history_index.search(query_embedding, k)
+            return [snapshot.history_df.iloc[idx].to_dict() for idx in indices[0]]
         else:
             return []
 
@@ -130,7 +253,9 @@ class RAGChatbot:
         # (⭐ 핵심 추가 2) 라우팅 전에 질문 재구성 실행
         rewritten_query = self._rewrite_query_with_history(query, chat_history)
         
-        route = self._semantic_route_query(rewritten_query)
+        # 요청 도중 스냅샷이 교체되어도 이 요청은 같은 스냅샷으로 끝까지 처리합니다.
+        snapshot = self.snapshot
+        route, filters = self._semantic_route_query(rewritten_query, snapshot)
         
         if route == "단순_대화":
             try:
@@ -140,11 +265,13 @@ class RAGChatbot:
                 return {"error": f"Gemini API 호출 중 오류 발생: {e}"}
 
         # 재구성된 질문으로 검색
-        retrieved_docs = self._search(rewritten_query, route)
+        retrieved_docs = self._search(rewritten_query, route, snapshot, filters=filters)
         
         context_for_llm = ""
         for doc in retrieved_docs:
             source = doc.get('source_file', '유물 DB: ' + doc.get('명칭', ''))
+            if doc.get('page_start') and doc.get('page_end'):
+                source += f", p.{int(doc['page_start'])}" + (f"-{int(doc['page_end'])}" if doc['page_end'] != doc['page_start'] else "")
             context_for_llm += f"### 참고 자료 (출처: {source}) ###\n"
             context_for_llm += f"내용: {doc.get('rag_document') or doc.get('text_chunk')}\n"
             if 'MUCH_URL' in doc and doc['MUCH_URL']: context_for_llm += f"관련 링크: {doc['MUCH_URL']}\n"
@@ -0,0 +1,297 @@
+# chunking.py
+import re
+import bisect
+import hashlib
+import inspect
+from collections import Counter
+import numpy as np
+
+# 문장 경계: 마침표류 뒤의 공백, 또는 공백 없이 이어지는 중국어/일본어 전각 문장부호 뒤
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?…])[’”"\')\]]*\s+|(?<=[。．！？])[」』”’）)]*\s*')
+# 문장 끝 판별 (표지/제목 블록 등 비문장 구획 판별에 사용)
+#   한국어 종결 어미('~다.', '~요.', '~까?'), 중국어/일본어 전각 문장부호, 숫자가 아닌 글자 뒤 마침표 + 공백(영문 등)
+SENTENCE_ENDING = re.compile(r'[다요죠까니오][.?!]|[。．！？]|[^\s\d.][.?!](?=\s|$)')
+# 쪽 번호만 있는 줄 ('12', '- 12 -', '•107', '72_', 펼침면의 '68 69')
+PAGE_NUMBER_LINE = re.compile(r'^[\s\-–•·_|]*\d{1,4}(?:\s+\d{1,4})?[\s\-–•·_|]*$')
+# '1.', '2)', 'Ⅲ.' 처럼 번호만 있는 조각은 문장으로 보지 않습니다.
+ENUMERATION_ONLY = re.compile(r'^(?:\d{1,3}|[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩ]+|[가-하])[.)]$')
+CONTROL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+
+
+def clean_text(text: str) -> str:
+    """제어 문자를 제거하고 공백을 하나로 정리합니다."""
+    return re.sub(r'\s+', ' ', CONTROL_CHARS.sub(' ', str(text))).strip()
+
+
+def remove_repeated_lines(pages: list, min_ratio: float = 0.5, min_pages: int = 3) -> list:
+    """
+    여러 페이지에 반복해서 나타나는 줄(머리글/바닥글)과 페이지 첫 줄/마지막 줄의 쪽 번호를 제거합니다.
+    본문 중간에 숫자만 있는 줄(연도 등)은 남겨 둡니다.
+
+    Args:
+        pages (list): (페이지 번호, 텍스트) 튜플 목록.
+        min_ratio (float): 전체 페이지 중 이 비율 이상에 나타난 줄을 반복 줄로 간주합니다.
+        min_pages (int): 이보다 페이지 수가 적은 문서에는 적용하지 않습니다.
+    """
+    if len(pages) < min_pages:
+        return pages
+    line_counts = Counter()
+    for _, text in pages:
+        line_counts.update({clean_text(line) for line in text.split('\n') if clean_text(line)})
+    repeated = {line for line, count in line_counts.items() if count >= max(min_pages, len(pages) * min_ratio)}
+
+    cleaned = []
+    for page_no, text in pages:
+        # 빈 줄은 문단 구분('\n\n')이므로 남기고, 내용이 있는 반복 줄만 제거
+        lines = [line for line in text.split('\n') if not (clean_text(line) and clean_text(line) in repeated)]
+        # 쪽 번호는 페이지 맨 위/아래의 (빈 줄이 아닌) 줄에 있을 때만 제거
+        content = [i for i, line in enumerate(lines) if clean_text(line)]
+        for i in sorted({content[0], content[-1]} if content else (), reverse=True):
+            if PAGE_NUMBER_LINE.match(lines[i]):
+                del lines[i]
+        cleaned.append((page_no, '\n'.join(lines)))
+    return cleaned
+
+
+def split_sentences(text: str, max_length: int = 500) -> list:
+    """
+    한국어 텍스트를 문장 단위로 나눕니다.
+    번호 조각('1.')은 다음 문장에 붙이고, 문장부호 없이 너무 긴 문장은 공백 기준으로 잘라냅니다.
+    """
+    sentences = []
+    pending = ''
+    for piece in SENTENCE_END_PATTERN.split(clean_text(text)):
+        piece = piece.strip()
+        if not piece:
+            continue
+        if ENUMERATION_ONLY.match(piece):
+            pending = f"{pending} {piece}".strip()
+            continue
+        sentences.append(f"{pending} {piece}".strip() if pending else piece)
+        pending = ''
+    if pending:
+        sentences.append(pending)
+
+    result = []
+    for sentence in sentences:
+        while len(sentence) > max_length:
+            cut = sentence.rfind(' ', 0, max_length)
+            cut = cut if cut > max_length // 2 else max_length
+            result.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            result.append(sentence)
+    return result
+
+
+class ParagraphChunker:
+    """
+    (기존 전략) 문단('\\n\\n')을 목표 크기까지 이어 붙입니다. 문장 경계와 중첩(overlap)은 고려하지 않습니다.
+    """
+    name = 'paragraph'
+
+    def __init__(self, target_size: int = 1500, min_length: int = 100):
+        self.target_size = target_size
+        self.min_length = min_length
+
+    def chunk(self, pages: list) -> list:
+        chunks = []
+        current, start_page, end_page = '', None, None
+
+        def flush():
+            if len(current) >= self.min_length:
+                chunks.append({'text': current, 'page_start': start_page, 'page_end': end_page})
+
+        for page_no, text in pages:
+            for paragraph in (text + '\n').split('\n\n'):
+                paragraph = clean_text(paragraph)
+                if not paragraph:
+                    continue
+                if current and len(current) + len(paragraph) + 1 > self.target_size:
+                    flush()
+                    current, start_page = paragraph, page_no
+                else:
+                    current = f"{current}\n\n{paragraph}" if current else paragraph
+                    start_page = start_page if start_page is not None else page_no
+                end_page = page_no
+        flush()
+        return chunks
+
+
+class SentenceChunker:
+    """
+    문장 단위로 목표 크기까지 이어 붙이고, 이전 구획의 마지막 문장들을 overlap 글자 수만큼 다음 구획에 겹쳐 넣습니다.
+    페이지를 하나의 텍스트로 이어서 문장을 나누므로 페이지 경계에 걸친 문장도 한 문장으로 유지됩니다.
+    """
+    name = 'sentence'
+
+    def __init__(self, target_size: int = 1000, overlap: int = 200, min_length: int = 100):
+        if overlap >= target_size:
+            raise ValueError("overlap은 target_size보다 작아야 합니다.")
+        self.target_size = target_size
+        self.overlap = overlap
+        self.min_length = min_length
+
+    @staticmethod
+    def _sentences_with_pages(pages: list, max_length: int) -> list:
+        """문서 전체를 한 줄로 이어 문장을 나누고, 글자 위치로 각 문장의 (시작 페이지, 끝 페이지)를 찾습니다."""
+        offsets, page_numbers, parts = [], [], []
+        position = 0
+        for page_no, text in pages:
+            text = clean_text(text)
+            if not text:
+                continue
+            offsets.append(position)
+            page_numbers.append(page_no)
+            parts.append(text)
+            position += len(text) + 1
+        stream = ' '.join(parts)
+
+        def page_at(offset):
+            return page_numbers[bisect.bisect_right(offsets, offset) - 1]
+
+        sentences = []
+        cursor = 0
+        for sentence in split_sentences(stream, max_length):
+            start = stream.find(sentence, cursor)
+            start = start if start >= 0 else cursor
+            end = start + len(sentence)
+            sentences.append((page_at(start), page_at(max(start, end - 1)), sentence))
+            cursor = end
+        return sentences
+
+    def chunk(self, pages: list) -> list:
+        sentences = self._sentences_with_pages(pages, self.target_size)
+        chunks = []
+        window = []  # (시작 페이지, 끝 페이지, 문장)
+        window_len = 0
+        new_in_window = 0  # 직전 구획 이후 새로 추가된 문장 수
+
+        def flush():
+            text = ' '.join(s for _, _, s in window)
+            if new_in_window and len(text) >= self.min_length:
+                chunks.append({'text': text, 'page_start': window[0][0], 'page_end': window[-1][1]})
+
+        for start_page, end_page, sentence in sentences:
+            if window and window_len + len(sentence) + 1 > self.target_size:
+                flush()
+                # 마지막 문장들을 overlap 크기 안에서 다음 구획으로 넘깁니다.
+                carried, carried_len = [], 0
+                for item in reversed(window):
+                    if carried_len + len(item[2]) + 1 > self.overlap:
+                        break
+                    carried.insert(0, item)
+                    carried_len += len(item[2]) + 1
+                window, window_len, new_in_window = carried, carried_len, 0
+            window.append((start_page, end_page, sentence))
+            window_len += len(sentence) + 1
+            new_in_window += 1
+        if window:
+            flush()
+        return chunks
+
+
+CHUNKERS = {
+    ParagraphChunker.name: ParagraphChunker,
+    SentenceChunker.name: SentenceChunker,
+}
+
+
+def get_chunker(strategy: str, **options):
+    """이름으로 구획 전략을 생성합니다. 전략이 받지 않는 옵션은 무시합니다."""
+    if strategy not in CHUNKERS:
+        raise ValueError(f"알 수 없는 구획 전략입니다: '{strategy}' (사용 가능: {list(CHUNKERS)})")
+    chunker_cls = CHUNKERS[strategy]
+    accepted = inspect.signature(chunker_cls).parameters
+    return chunker_cls(**{k: v for k, v in options.items() if k in accepted})
+
+
+def is_boilerplate(text: str, max_length: int = 400, min_sentences: int = 1, max_repeat_ratio: float = 0.5) -> bool:
+    """
+    표지, 국/영문 제목 블록처럼 짧으면서 서술 문장이 없거나 같은 어절이 반복되는 페이지/구획인지 판별합니다.
+    max_length보다 긴 텍스트는 문장부호가 없어도(도판 설명, 참고문헌, 표 등) 본문으로 보고 남겨 둡니다.
+    """
+    text = clean_text(text)
+    if len(text) > max_length:
+        return False
+    if len(SENTENCE_ENDING.findall(text)) < min_sentences:
+        return True
+    words = text.split()
+    return len(words) >= 10 and 1 - len(set(words)) / len(words) > max_repeat_ratio
+
+
+def simhash(text: str, shingle_size: int = 4, bits: int = 64) -> int:
+    """공백을 제거한 글자 n-gram을 특징으로 하는 SimHash 지문을 계산합니다."""
+    compact = re.sub(r'\s+', '', text)
+    shingles = Counter(compact[i:i + shingle_size] for i in range(max(1, len(compact) - shingle_size + 1)))
+    digests = b''.join(hashlib.blake2b(s.encode('utf-8'), digest_size=bits // 8).digest() for s in shingles)
+    # (shingle 수, bits) 비트 행렬에 출현 횟수를 가중치로 곱해 비트별 투표
+    bit_matrix = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(len(shingles), -1), axis=1, bitorder='little')
+    weights = np.fromiter(shingles.values(), dtype=np.int64, count=len(shingles)) @ (bit_matrix.astype(np.int64) * 2 - 1)
+    return int.from_bytes(np.packbits(weights > 0, bitorder='little').tobytes(), 'little')
+
+
+class NearDuplicateFilter:
+    """
+    SimHash 해밍 거리가 threshold 이하인 구획을 중복으로 간주합니다.
+    64비트를 (threshold + 1)개 밴드로 나눠 같은 밴드 값을 가진 후보끼리만 비교합니다.
+    """
+    def __init__(self, threshold: int = 3, bits: int = 64):
+        self.threshold = threshold
+        self.bits = bits
+        self.n_bands = threshold + 1
+        self.band_bits = bits // self.n_bands
+        self.buckets = {}
+
+    def _bands(self, fingerprint: int):
+        mask = (1 << self.band_bits) - 1
+        return [(band, fingerprint >> (band * self.band_bits) & mask) for band in range(self.n_bands)]
+
+    def is_duplicate(self, text: str) -> bool:
+        """이미 본 구획과 중복이면 True, 아니면 등록하고 False를 반환합니다."""
+        fingerprint = simhash(text, bits=self.bits)
+        bands = self._bands(fingerprint)
+        for key in bands:
+            for other in self.buckets.get(key, ()):
+                if bin(fingerprint ^ other).count('1') <= self.threshold:
+                    return True
+        for key in bands:
+            self.buckets.setdefault(key, []).append(fingerprint)
+        return False
+
+
+def chunk_documents(documents: dict, chunker, remove_boilerplate: bool = True, deduplicate: bool = True,
+                    dedupe_threshold: int = 3, stats: dict | None = None) -> list:
+    """
+    문서별 페이지 텍스트를 구획으로 나누고, 반복 머리글/상용구/중복 구획을 제거합니다.
+
+    Args:
+        documents (dict): 파일명 → (페이지 번호, 텍스트) 튜플 목록.
+        chunker: ParagraphChunker/SentenceChunker 등 chunk(pages) 메서드를 가진 객체.
+        stats (dict): 주어지면 파일명 → {chunks, boilerplate_pages, boilerplate_chunks, duplicate_chunks} 집계를 채웁니다.
+
+    Returns:
+        list: source_file, text_chunk, page_start, page_end 키를 가진 dict 목록.
+    """
+    duplicate_filter = NearDuplicateFilter(dedupe_threshold) if deduplicate else None
+    rows = []
+    for source_file, pages in documents.items():
+        counts = {'chunks': 0, 'boilerplate_pages': 0, 'boilerplate_chunks': 0, 'duplicate_chunks': 0}
+        if remove_boilerplate:
+            # 표지/제목 블록처럼 짧고 서술 문장이 없는 페이지는 구획을 만들기 전에 제외
+            kept = [(page_no, text) for page_no, text in remove_repeated_lines(pages) if not is_boilerplate(text)]
+            counts['boilerplate_pages'] = len(pages) - len(kept)
+            pages = kept
+        for chunk in chunker.chunk(pages):
+            if remove_boilerplate and is_boilerplate(chunk['text']):
+                counts['boilerplate_chunks'] += 1
+                continue
+            if duplicate_filter and duplicate_filter.is_duplicate(chunk['text']):
+                counts['duplicate_chunks'] += 1
+                continue
+            counts['chunks'] += 1
+            rows.append({'source_file': source_file, 'text_chunk': chunk['text'],
+                         'page_start': chunk['page_start'], 'page_end': chunk['page_end']})
+        if stats is not None:
+            stats[source_file] = counts
+    return rows
@@ -8,8 +8,50 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 EMBEDDING_MODEL = 'upskyy/bge-m3-korean'
 LLM_MODEL = 'gemini-1.5-pro-latest'
 
+# 임베딩 서빙 프로필: 'full'(전체 모델), 'lite'(경량 정적 인코더), 'auto'(사용 가능 메모리로 자동 선택)
+# 'auto'는 vector_store/lite가 없으면 항상 전체 모델을 쓰므로, 경량 프로필을 만들기 전에는 'full'과 같습니다.
+EMBEDDING_PROFILE = 'auto'
+FULL_PROFILE_MIN_AVAILABLE_MB = 4096
+
 VECTOR_STORE_DIR = os.path.join(BASE_DIR, 'vector_store')
 ARTIFACT_INDEX_PATH = os.path.join(VECTOR_STORE_DIR, 'artifacts.index')
 ARTIFACT_DF_PATH = os.path.join(VECTOR_STORE_DIR, 'artifacts_df.pkl')
 HISTORY_INDEX_PATH = os.path.join(VECTOR_STORE_DIR, 'history.index')
-HISTORY_DF_PATH = os.path.join(VECTOR_STORE_DIR, 'history_df.pkl')
\ No newline at end of file
+HISTORY_DF_PATH = os.path.join(VECTOR_STORE_DIR, 'history_df.pkl')
+
+# 벡터 스토어 스냅샷 (버전별 폴더 + CURRENT 포인터). 스냅샷이 없으면 위의 기존 경로를 사용합니다.
+SNAPSHOT_DIR = os.path.join(VECTOR_STORE_DIR, 'snapshots')
+CURRENT_SNAPSHOT_PATH = os.path.join(VECTOR_STORE_DIR, 'CURRENT')
+SNAPSHOT_POLL_INTERVAL = 30   # 새 스냅샷 게시 여부를 확인하는 주기(초). 0이면 자동 교체하지 않습니다.
+SNAPSHOT_KEEP = 5             # 롤백용으로 보관할 스냅샷 개수
+
+# 경량 임베딩 프로필 (토큰 임베딩 표 + 투영 행렬 + 자주 묻는 질문 벡터)
+LITE_PROFILE_DIR = os.path.join(VECTOR_STORE_DIR, 'lite')
+
+# 첫 화면 추천 질문과, 질의 벡터를 미리 계산해 둘 자주 묻는 질문
+SUGGESTED_QUESTIONS = ["무령왕릉은 언제, 어떻게 발견되었나요?", "진묘수에 대해 자세히 알려주세요.", "왕의 귀걸이는 어떻게 생겼어?"]
+FREQUENT_QUESTIONS = SUGGESTED_QUESTIONS + [
+    "무령왕릉은 누구의 무덤인가요?",
+    "무령왕릉 지석에는 어떤 내용이 적혀 있나요?",
+    "무령왕릉의 벽돌무덤 구조는 어떤 특징이 있나요?",
+    "왕비의 관 꾸미개는 어떻게 생겼어?",
+    "무령왕릉에서 출토된 국보는 무엇이 있나요?",
+    "무령왕의 장례는 어떻게 치러졌나요?",
+]
+
+# 이미지 및 썸네일 설정
+IMAGE_SOURCE_DIR = os.path.join(BASE_DIR, 'data', 'extracted_images')
+THUMBNAIL_DIR = os.path.join(BASE_DIR, 'data', 'thumbnails')
+IMAGE_MANIFEST_PATH = os.path.join(THUMBNAIL_DIR, 'image_manifest.json')
+THUMBNAIL_SIZES = [120, 300]          # 생성할 썸네일 가로 폭(px). 원본보다 크게 확대하지 않습니다.
+THUMBNAIL_FORMATS = ['avif', 'webp']  # 선호 순서. Pillow가 지원하지 않는 포맷은 건너뜁니다.
+THUMBNAIL_QUALITY = 75
+DEFAULT_IMAGE_WIDTH = 300
+IMAGE_CACHE_MAX_AGE = 60 * 60 * 24 * 7  # 이미지 응답의 Cache-Control max-age(초)
+
+# PDF 구획(Chunking) 설정
+CHUNK_STRATEGY = 'sentence'   # 'sentence'(문장 경계 + overlap) 또는 'paragraph'(기존 문단 병합)
+CHUNK_TARGET_SIZE = 1200      # 구획의 목표 글자 수
+CHUNK_OVERLAP = 0             # 이웃 구획과 겹치는 글자 수 (sentence 전략, 벤치마크상 재현율 이득 없이 벡터 수만 늘어 기본값 0)
+CHUNK_MIN_LENGTH = 100        # 유의미한 구획으로 간주할 최소 글자 수
+CHUNK_DEDUPE_THRESHOLD = 3    # SimHash 해밍 거리가 이 값 이하이면 중복 구획으로 제거
@@ -3,6 +3,16 @@ import pandas as pd
 import re
 import os
 
+def create_rag_document(row) -> str:
+    """유물 한 행을 임베딩/LLM 컨텍스트에 사용할 단일 텍스트 문서로 만듭니다."""
+    document = (
+        f"[유물명]: {row['명칭']}\n[시대]: {row['국적/시대1']}\n"
+        f"[재질]: {row['재질1']}\n[지정 정보]: {row['지정구분']}\n"
+        f"[주요 특징]: {row['특징']}\n[상세 설명]: {row['신보고서 종합편 설명 내용']}\n"
+        f"[참고 자료]: {row['참고자료']}"
+    )
+    return re.sub(r'\s+', ' ', document).strip()
+
 def preprocess_artifacts_csv(input_path: str, output_path: str, base_url: str):
     """
     (이미지 파일명 오류 수정 버전)
@@ -53,17 +63,10 @@ def preprocess_artifacts_csv(input_path: str, output_path: str, base_url: str):
         df_processed['image_url'] = df_processed.apply(create_image_url_from_ids, axis=1)
         print("  - '소장품번호'와 '세부번호' 기준으로 이미지 URL 재생성 완료.")
 
-        def create_rag_document(row):
-            return (
-                f"[유물명]: {row['명칭']}\n[시대]: {row['국적/시대1']}\n"
-                f"[재질]: {row['재질1']}\n[지정 정보]: {row['지정구분']}\n"
-                f"[주요 특징]: {row['특징']}\n[상세 설명]: {row['신보고서 종합편 설명 내용']}\n"
-                f"[참고 자료]: {row['참고자료']}"
-            )
         df_processed['rag_document'] = df_processed.apply(create_rag_document, axis=1)
-        df_processed['rag_document'] = df_processed['rag_document'].apply(lambda x: re.sub(r'\s+', ' ', x).strip())
 
-        final_df = df_processed[['id', '명칭', '소장품번호', 'rag_document', 'MUCH_URL', 'image_url']]
+        # 메타데이터 필터 검색(시대/재질/지정구분)을 위해 구조화 컬럼도 함께 보관
+        final_df = df_processed[['id', '명칭', '소장품번호', '국적/시대1', '재질1', '지정구분', 'rag_document', 'MUCH_URL', 'image_url']]
         
         final_df = final_df.dropna(subset=['id'])
         final_df = final_df[final_df['id'] != 'nan']
@@ -0,0 +1,189 @@
+# image_processor.py
+import os
+import json
+import hashlib
+from functools import lru_cache
+from PIL import Image, ImageOps, features
+import config
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+MIMETYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpg': 'image/jpeg', 'jpeg': 'image/jpeg', 'png': 'image/png'}
+PIL_FORMATS = {'avif': 'AVIF', 'webp': 'WEBP'}
+
+
+def _file_etag(path: str) -> str:
+    """파일 내용 기반의 ETag 값을 계산합니다."""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+def _original_entry(source_dir: str, file_name: str) -> dict:
+    path = os.path.join(source_dir, file_name)
+    return {"file": file_name, "bytes": os.path.getsize(path), "etag": None, "variants": {}}
+
+
+def build_image_manifest(
+    source_dir: str = config.IMAGE_SOURCE_DIR,
+    thumbnail_dir: str = config.THUMBNAIL_DIR,
+    manifest_path: str = config.IMAGE_MANIFEST_PATH,
+    sizes: list = config.THUMBNAIL_SIZES,
+    formats: list = config.THUMBNAIL_FORMATS,
+    quality: int = config.THUMBNAIL_QUALITY,
+):
+    """
+    원본 유물 이미지로부터 여러 크기의 WebP/AVIF 썸네일을 미리 생성하고,
+    이미지 ID(파일명에서 확장자를 뺀 값) → 파일 정보 매니페스트를 저장합니다.
+    이미 생성된 썸네일이 원본보다 최신이면 다시 인코딩하지 않습니다.
+    """
+    print(f"🔄 이미지 썸네일 생성 시작: '{source_dir}'")
+
+    available_formats = [fmt for fmt in formats if features.check(fmt)]
+    skipped = set(formats) - set(available_formats)
+    if skipped:
+        print(f"  - ⚠️ 현재 Pillow가 지원하지 않아 건너뛰는 포맷: {sorted(skipped)}")
+
+    manifest = {}
+    try:
+        if not os.path.isdir(source_dir):
+            print(f"🚨 오류: '{source_dir}' 폴더를 찾을 수 없습니다.")
+            return
+        os.makedirs(thumbnail_dir, exist_ok=True)
+
+        image_files = sorted(f for f in os.listdir(source_dir) if f.lower().endswith(IMAGE_EXTENSIONS))
+        original_total, thumbnail_total = 0, 0
+        for file_name in image_files:
+            source_path = os.path.join(source_dir, file_name)
+            image_id = os.path.splitext(file_name)[0]
+            entry = _original_entry(source_dir, file_name)
+            entry["etag"] = _file_etag(source_path)
+            original_total += entry["bytes"]
+
+            with Image.open(source_path) as img:
+                img = ImageOps.exif_transpose(img).convert('RGB')
+                entry["width"], entry["height"] = img.size
+
+                for fmt in available_formats:
+                    entry["variants"][fmt] = {}
+                    for size in sizes:
+                        # 원본보다 크게 확대하지 않습니다.
+                        width = min(size, img.width)
+                        height = max(1, round(img.height * width / img.width))
+                        thumb_name = f"{image_id}-w{width}.{fmt}"
+                        thumb_path = os.path.join(thumbnail_dir, thumb_name)
+
+                        if not os.path.exists(thumb_path) or os.path.getmtime(thumb_path) < os.path.getmtime(source_path):
+                            thumb = img.resize((width, height), Image.LANCZOS) if width != img.width else img
+                            thumb.save(thumb_path, PIL_FORMATS[fmt], quality=quality)
+
+                        entry["variants"][fmt][str(size)] = {
+                            "file": thumb_name, "width": width, "height": height,
+                            "bytes": os.path.getsize(thumb_path), "etag": _file_etag(thumb_path),
+                        }
+                        thumbnail_total += entry["variants"][fmt][str(size)]["bytes"]
+            manifest[image_id] = entry
+
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, manifest_path)
+        load_image_manifest.cache_clear()
+
+        print(f"  - 이미지 {len(manifest)}개, 포맷 {available_formats}, 크기 {sizes} 썸네일 생성 완료.")
+        print(f"  - 원본 합계 {original_total / 1024:.1f}KB / 썸네일 합계 {thumbnail_total / 1024:.1f}KB")
+        print(f"✅ 완료: 매니페스트가 '{manifest_path}'에 저장되었습니다.")
+
+    except Exception as e:
+        print(f"🚨 오류: 썸네일 생성 중 예상치 못한 문제가 발생했습니다 - {e}")
+
+
+@lru_cache(maxsize=None)
+def load_image_manifest(manifest_path: str = config.IMAGE_MANIFEST_PATH, source_dir: str = config.IMAGE_SOURCE_DIR) -> dict:
+    """
+    이미지 매니페스트를 한 번만 읽어 메모리에 보관합니다.
+    매니페스트가 아직 없으면 원본 폴더를 한 번 스캔하여 원본 이미지만으로 구성합니다.
+    """
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    print("  - ⚠️ 이미지 매니페스트가 없어 원본 이미지만 사용합니다. (image_processor.py 실행 필요)")
+    if not os.path.isdir(source_dir):
+        return {}
+    return {
+        os.path.splitext(f)[0]: _original_entry(source_dir, f)
+        for f in os.listdir(source_dir) if f.lower().endswith(IMAGE_EXTENSIONS)
+    }
+
+
+def image_id_from_url(image_url: str) -> str:
+    """'/static/images/mur000001-00-00.jpg' 형태의 URL에서 이미지 ID를 추출합니다."""
+    return os.path.splitext(str(image_url).split('?')[0].rstrip('/').split('/')[-1])[0]
+
+
+def lookup_image(image_url: str) -> dict | None:
+    if not image_url:
+        return None
+    return load_image_manifest().get(image_id_from_url(image_url))
+
+
+def select_variant(entry: dict, width: int | None = None, accept: str = '') -> tuple[str, dict, str]:
+    """
+    요청한 폭과 브라우저의 Accept 헤더에 맞는 썸네일 중 용량이 가장 작은 것을 고릅니다.
+    원본이 더 작거나 적합한 썸네일이 없으면 원본 파일을 반환합니다.
+
+    Returns:
+        (파일 경로, 파일 정보, MIME 타입)
+    """
+    width = width or config.DEFAULT_IMAGE_WIDTH
+    ext = os.path.splitext(entry["file"])[1].lstrip('.').lower()
+    best = (os.path.join(config.IMAGE_SOURCE_DIR, entry["file"]), entry, MIMETYPES.get(ext, 'application/octet-stream'))
+    # 원본보다 작은 폭을 요청한 경우에는 원본을 후보로 두지 않습니다.
+    best_bytes = entry["bytes"] if width >= entry.get("width", width) else float('inf')
+
+    for fmt in config.THUMBNAIL_FORMATS:
+        variants = entry.get("variants", {}).get(fmt)
+        # Accept 헤더에 명시적으로 포함된 포맷만 사용합니다. (빈 값이면 모든 포맷 허용)
+        if not variants or (accept and MIMETYPES[fmt] not in accept):
+            continue
+        candidates = sorted(variants.values(), key=lambda v: v["width"])
+        chosen = next((v for v in candidates if v["width"] >= width), candidates[-1])
+        if chosen["bytes"] < best_bytes:
+            best = (os.path.join(config.THUMBNAIL_DIR, chosen["file"]), chosen, MIMETYPES[fmt])
+            best_bytes = chosen["bytes"]
+    return best
+
+
+def local_image_path(image_url: str, width: int | None = None) -> str | None:
+    """로컬 렌더링(Streamlit 등)에 사용할 이미지 파일 경로를 반환합니다."""
+    entry = lookup_image(image_url)
+    if entry is None:
+        return None
+    path, _, _ = select_variant(entry, width, accept='image/webp')
+    return path
+
+
+def describe_image(image_url: str) -> dict | None:
+    """웹 클라이언트가 지연 로딩용 <img> 태그를 만들 수 있도록 src/srcset 정보를 구성합니다."""
+    entry = lookup_image(image_url)
+    if entry is None:
+        return None
+    base_url = str(image_url).split('?')[0]
+    _, default_variant, _ = select_variant(entry, config.DEFAULT_IMAGE_WIDTH, accept='image/webp')
+
+    srcset = []
+    webp_variants = entry.get("variants", {}).get('webp', {})
+    for size, variant in sorted(webp_variants.items(), key=lambda item: int(item[0])):
+        srcset.append(f"{base_url}?w={size} {variant['width']}w")
+
+    return {
+        "src": f"{base_url}?w={config.DEFAULT_IMAGE_WIDTH}",
+        "srcset": ", ".join(srcset),
+        "width": entry.get("width"),
+        "height": entry.get("height"),
+        "bytes": default_variant["bytes"],
+        "original_bytes": entry["bytes"],
+    }
+
+
+if __name__ == '__main__':
+    build_image_manifest()
@@ -0,0 +1,109 @@
+# metadata_index.py
+import re
+import numpy as np
+import faiss
+
+# 라우터가 사용하는 필터 이름 → 데이터프레임 컬럼
+FILTER_FIELDS = {
+    '시대': '국적/시대1',
+    '재질': '재질1',
+    '지정구분': '지정구분',
+}
+
+# 구조화 컬럼이 없는 이전 벡터 스토어를 위해 rag_document에서 값을 복원할 때 쓰는 라벨
+RAG_DOCUMENT_LABELS = {
+    '국적/시대1': '시대',
+    '재질1': '재질',
+    '지정구분': '지정 정보',
+}
+
+MISSING_VALUES = {'', 'nan', 'none'}
+
+
+def extract_fields_from_rag_document(rag_document: str) -> dict:
+    """'[재질]: 금속-금 [지정 정보]: ...' 형태의 rag_document에서 구조화 컬럼 값을 추출합니다."""
+    fields = {}
+    for column, label in RAG_DOCUMENT_LABELS.items():
+        match = re.search(rf'\[{re.escape(label)}\]: (.*?)(?= \[|$)', str(rag_document))
+        fields[column] = match.group(1).strip() if match else ''
+    return fields
+
+
+def _value_tokens(value) -> set:
+    """'금속-금'은 '금속-금', '금속', '금' 모두로 검색될 수 있도록 토큰을 만듭니다."""
+    value = str(value).strip()
+    if value.lower() in MISSING_VALUES:
+        return set()
+    tokens = {value}
+    tokens.update(part.strip() for part in re.split(r'[-/,]', value) if part.strip())
+    return tokens
+
+
+class MetadataIndex:
+    """
+    유물 데이터프레임의 구조화 컬럼(시대, 재질, 지정구분)에 대한 역색인.
+    값(토큰)마다 행 번호의 비트맵(bool 배열)을 보관하여, 필터 조건을 비트 연산만으로 평가합니다.
+    """
+    def __init__(self, df):
+        self.size = len(df)
+        self.postings = {name: {} for name in FILTER_FIELDS}
+
+        for name, column in FILTER_FIELDS.items():
+            if column in df.columns:
+                values = df[column].tolist()
+            elif 'rag_document' in df.columns:
+                values = [extract_fields_from_rag_document(doc)[column] for doc in df['rag_document']]
+            else:
+                continue
+            for row, value in enumerate(values):
+                for token in _value_tokens(value):
+                    bitmap = self.postings[name].setdefault(token, np.zeros(self.size, dtype=bool))
+                    bitmap[row] = True
+
+    def values(self, name: str) -> list:
+        """필터 이름에 사용할 수 있는 값 목록 (라우터 프롬프트 힌트용)."""
+        return sorted(self.postings.get(name, {}))
+
+    def select(self, filters: dict | None) -> np.ndarray | None:
+        """
+        필터 조건에 맞는 행의 비트맵을 반환합니다.
+        같은 필드의 값끼리는 OR, 서로 다른 필드끼리는 AND로 결합합니다.
+        적용할 필터가 없으면 None을 반환합니다.
+        """
+        mask = None
+        for name, values in (filters or {}).items():
+            if name not in self.postings or not values:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            field_mask = np.zeros(self.size, dtype=bool)
+            for value in values:
+                bitmap = self.postings[name].get(str(value).strip())
+                if bitmap is not None:
+                    field_mask |= bitmap
+            mask = field_mask if mask is None else (mask & field_mask)
+        return mask
+
+
+def filtered_search(index, query_embedding, k: int, mask: np.ndarray | None = None):
+    """
+    FAISS 검색을 수행합니다. mask가 주어지면 IDSelectorBitmap으로 해당 행만 대상으로 검색(pre-filtering)하며,
+    결과 중 채워지지 않은 자리(-1)는 제거합니다.
+
+    Returns:
+        (distances, indices) - 각각 1차원 배열
+    """
+    if mask is None:
+        distances, indices = index.search(query_embedding, k)
+        return distances[0], indices[0]
+
+    n_matches = int(mask.sum())
+    if n_matches == 0:
+        return np.empty(0, dtype='float32'), np.empty(0, dtype='int64')
+
+    bitmap = np.packbits(mask, bitorder='little')
+    selector = faiss.IDSelectorBitmap(len(mask), faiss.swig_ptr(bitmap))
+    params = faiss.SearchParameters(sel=selector)
+    distances, indices = index.search(query_embedding, min(k, n_matches), params=params)
+    keep = indices[0] >= 0
+    return distances[0][keep], indices[0][keep]
@@ -1,25 +1,42 @@
 import fitz  # PyMuPDF
 import pandas as pd
 import os
-import re
+import config
+from chunking import get_chunker, chunk_documents
 
-def sectionize_and_preprocess_pdfs(pdf_directory: str, output_path: str, target_chunk_size: int = 1500, min_chunk_length: int = 100):
+def extract_pages(file_path: str) -> list:
+    """PDF의 각 페이지 텍스트를 (페이지 번호, 텍스트) 튜플 목록으로 추출합니다."""
+    with fitz.open(file_path) as doc:
+        return [(page.number + 1, page.get_text("text")) for page in doc]
+
+def sectionize_and_preprocess_pdfs(
+    pdf_directory: str,
+    output_path: str,
+    strategy: str = config.CHUNK_STRATEGY,
+    target_chunk_size: int = config.CHUNK_TARGET_SIZE,
+    min_chunk_length: int = config.CHUNK_MIN_LENGTH,
+    overlap: int = config.CHUNK_OVERLAP,
+    remove_boilerplate: bool = True,
+    deduplicate: bool = True,
+):
     """
-    (전략 변경: Sectioning 버전)
-    PDF 텍스트를 적절한 크기의 의미있는 '구획(Section)'으로 묶어 저장합니다.
+    (전략 변경: 플러그인 Chunking 버전)
+    PDF 텍스트를 선택한 구획 전략으로 나누고, 반복 머리글/표지/중복 구획을 제거한 뒤
+    구획별 페이지 범위와 함께 저장합니다.
 
     Args:
         pdf_directory (str): PDF 파일들이 있는 폴더 경로.
         output_path (str): 정제된 텍스트 구획을 저장할 CSV 파일 경로.
+        strategy (str): 구획 전략 이름 ('sentence' 또는 'paragraph', chunking.CHUNKERS 참고).
         target_chunk_size (int): 목표로 하는 구획의 글자 수.
         min_chunk_length (int): 유의미한 구획으로 간주할 최소 글자 수.
+        overlap (int): 이웃 구획과 겹치는 글자 수 ('sentence' 전략에만 적용).
+        remove_boilerplate (bool): 반복 머리글/바닥글, 표지·제목·목차 구획 제거 여부.
+        deduplicate (bool): SimHash 기반 중복 구획 제거 여부.
     """
-    print("🔄 PDF 처리 프로세스 시작 (Sectioning 전략)...")
-    
-    all_sections = []
+    print(f"🔄 PDF 처리 프로세스 시작 ('{strategy}' 구획 전략)...")
     
     try:
-        # ... (이전과 동일한 파일 경로 및 존재 여부 확인 로직) ...
         if not os.path.isdir(pdf_directory):
             print(f"🚨 오류: '{pdf_directory}' 폴더를 찾을 수 없습니다.")
             return
@@ -27,48 +44,25 @@ def sectionize_and_preprocess_pdfs(pdf_directory: str, output_path: str, target_
         pdf_files = [f for f in os.listdir(pdf_directory) if f.lower().endswith('.pdf')]
         print(f"  - 총 {len(pdf_files)}개의 PDF 파일을 발견했습니다: {pdf_files}")
 
+        documents = {}
         for filename in pdf_files:
-            file_path = os.path.join(pdf_directory, filename)
             print(f"  - '{filename}' 파일 처리 중...")
-            
-            doc = fitz.open(file_path)
-            full_text = "".join(page.get_text("text") + "\n" for page in doc)
-            doc.close()
+            documents[filename] = extract_pages(os.path.join(pdf_directory, filename))
 
-            # 1. 텍스트를 문단 단위로 분할
-            paragraphs = full_text.split('\n\n')
-            
-            # 2. 문단을 합쳐 구획(Section) 생성
-            current_section = ""
-            processed_sections = 0
-            for p in paragraphs:
-                cleaned_p = re.sub(r'\s+', ' ', p).strip()
-                if not cleaned_p:
-                    continue
-
-                # 현재 구획에 문단을 추가했을 때 목표 크기를 넘는지 확인
-                if len(current_section) + len(cleaned_p) + 1 > target_chunk_size and len(current_section) > 0:
-                    # 목표 크기를 넘으면, 현재까지의 구획을 저장
-                    if len(current_section) >= min_chunk_length:
-                        all_sections.append({'source_file': filename, 'text_chunk': current_section})
-                        processed_sections += 1
-                    # 현재 문단으로 새로운 구획 시작
-                    current_section = cleaned_p
-                else:
-                    # 목표 크기를 넘지 않으면, 현재 구획에 문단을 계속 추가
-                    if current_section:
-                        current_section += "\n\n" + cleaned_p
-                    else:
-                        current_section = cleaned_p
-            
-            # 마지막 남은 구획 저장
-            if len(current_section) >= min_chunk_length:
-                all_sections.append({'source_file': filename, 'text_chunk': current_section})
-                processed_sections += 1
-            
-            print(f"    -> 의미있는 구획(Section) {processed_sections}개 생성 완료.")
+        chunker = get_chunker(strategy, target_size=target_chunk_size, min_length=min_chunk_length, overlap=overlap)
+        stats = {}
+        all_sections = chunk_documents(
+            documents, chunker,
+            remove_boilerplate=remove_boilerplate, deduplicate=deduplicate,
+            dedupe_threshold=config.CHUNK_DEDUPE_THRESHOLD, stats=stats,
+        )
+        for filename in pdf_files:
+            counts = stats[filename]
+            print(f"    -> '{filename}': 의미있는 구획(Section) {counts['chunks']}개 생성 완료. "
+                  f"(제외: 표지/제목 페이지 {counts['boilerplate_pages']}개, "
+                  f"상용구 구획 {counts['boilerplate_chunks']}개, 중복 구획 {counts['duplicate_chunks']}개)")
 
-        df_sections = pd.DataFrame(all_sections)
+        df_sections = pd.DataFrame(all_sections, columns=['source_file', 'text_chunk', 'page_start', 'page_end'])
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         df_sections.to_csv(output_path, index=False, encoding='utf-8-sig')
         
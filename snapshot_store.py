@@ -0,0 +1,187 @@
+# snapshot_store.py
+import os
+import json
+import time
+import pickle
+import shutil
+import hashlib
+import uuid
+import faiss
+import config
+from metadata_index import MetadataIndex
+
+MANIFEST_FILE = 'manifest.json'
+STORE_FILES = {
+    'artifacts': ('artifacts.index', 'artifacts_df.pkl'),
+    'history': ('history.index', 'history_df.pkl'),
+}
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: str, text: str):
+    """임시 파일에 쓴 뒤 os.replace로 교체하여, 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 합니다."""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def new_version() -> str:
+    return time.strftime('%Y%m%d-%H%M%S')
+
+
+def snapshot_path(version: str) -> str:
+    return os.path.join(config.SNAPSHOT_DIR, version)
+
+
+def staging_path(version: str) -> str:
+    """
+    구축 중인 스냅샷을 쓰는 임시 폴더. 점(.)으로 시작하므로 list_snapshots에 나타나지 않습니다.
+    같은 초에 시작한 구축끼리 폴더를 공유하지 않도록 pid와 임의 접미사를 붙이고, 이미 있으면 오류를 냅니다.
+    """
+    os.makedirs(config.SNAPSHOT_DIR, exist_ok=True)
+    path = os.path.join(config.SNAPSHOT_DIR, f'.staging-{version}-{os.getpid()}-{uuid.uuid4().hex[:8]}')
+    os.makedirs(path)
+    return path
+
+
+def read_current() -> str | None:
+    """현재 게시된 스냅샷 버전을 반환합니다. 게시된 스냅샷이 없으면 None."""
+    try:
+        with open(config.CURRENT_SNAPSHOT_PATH, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def check_version(version) -> str:
+    """게시된 스냅샷 버전 이름인지 확인합니다. 외부 입력(관리자 API, CURRENT 파일)이 경로로 쓰이기 전에 호출합니다."""
+    if not isinstance(version, str) or version not in list_snapshots():
+        raise ValueError(f"알 수 없는 스냅샷 버전입니다: {version!r}")
+    return version
+
+
+def set_current(version: str):
+    check_version(version)
+    _write_atomic(config.CURRENT_SNAPSHOT_PATH, version)
+
+
+def list_snapshots() -> list:
+    """게시된 스냅샷 버전 목록 (오래된 순)."""
+    if not os.path.isdir(config.SNAPSHOT_DIR):
+        return []
+    return sorted(
+        name for name in os.listdir(config.SNAPSHOT_DIR)
+        if not name.startswith('.') and os.path.exists(os.path.join(config.SNAPSHOT_DIR, name, MANIFEST_FILE))
+    )
+
+
+def load_manifest(version: str) -> dict:
+    with open(os.path.join(snapshot_path(version), MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def publish_snapshot(staging_dir: str, version: str, embedding_model: str, stores: dict) -> str:
+    """
+    구축이 끝난 임시 폴더에 매니페스트를 기록하고, 스냅샷 폴더로 이름을 바꾼 뒤 CURRENT 포인터를 교체합니다.
+    두 단계 모두 원자적 rename이므로 실행 중인 서버는 완성된 스냅샷만 보게 됩니다.
+
+    Args:
+        stores (dict): 저장소 이름 → {index_type, ntotal, dim, rows} 정보.
+    """
+    manifest = {
+        'version': version,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'embedding_model': embedding_model,
+        'stores': {},
+    }
+    for name, info in stores.items():
+        index_file, df_file = STORE_FILES[name]
+        manifest['stores'][name] = {
+            **info,
+            'files': {
+                file_name: _sha256(os.path.join(staging_dir, file_name))
+                for file_name in (index_file, df_file)
+            },
+        }
+    _write_atomic(os.path.join(staging_dir, MANIFEST_FILE), json.dumps(manifest, ensure_ascii=False, indent=2))
+
+    final_dir = snapshot_path(version)
+    if os.path.exists(final_dir):
+        raise FileExistsError(f"스냅샷 '{version}'이 이미 존재합니다.")
+    os.rename(staging_dir, final_dir)
+    set_current(version)
+    return final_dir
+
+
+def verify_snapshot(version: str) -> dict:
+    """매니페스트의 체크섬과 실제 파일을 비교합니다. 일치하지 않으면 ValueError."""
+    manifest = load_manifest(version)
+    for name, store in manifest['stores'].items():
+        for file_name, checksum in store['files'].items():
+            if _sha256(os.path.join(snapshot_path(version), file_name)) != checksum:
+                raise ValueError(f"스냅샷 '{version}'의 '{file_name}' 체크섬이 매니페스트와 다릅니다.")
+    return manifest
+
+
+def prune_snapshots(keep: int = config.SNAPSHOT_KEEP):
+    """최근 keep개와 현재 게시된 스냅샷을 제외한 오래된 스냅샷을 삭제합니다."""
+    current = read_current()
+    for version in list_snapshots()[:-keep]:
+        if version != current:
+            shutil.rmtree(snapshot_path(version), ignore_errors=True)
+
+
+class VectorStoreSnapshot:
+    """
+    한 버전의 인덱스와 데이터프레임 묶음. 한 번 만들어지면 변경하지 않으므로,
+    요청 처리 중에는 시작 시점에 잡은 스냅샷을 끝까지 안전하게 사용할 수 있습니다.
+    """
+    def __init__(self, version: str, artifact_index, artifact_df, history_index, history_df, manifest: dict | None = None):
+        self.version = version
+        self.artifact_index = artifact_index
+        self.artifact_df = artifact_df
+        self.history_index = history_index
+        self.history_df = history_df
+        self.artifact_metadata = MetadataIndex(artifact_df)
+        self.manifest = manifest or {}
+        self.loaded_at = time.time()
+
+
+def _load_store(store_name: str, index_path: str, df_path: str):
+    if not os.path.exists(index_path) or not os.path.exists(df_path):
+        raise FileNotFoundError(f"'{store_name}'의 벡터 스토어 파일이 없습니다.")
+    print(f"  - '{store_name}' 벡터 스토어 로딩...")
+    index = faiss.read_index(index_path)
+    with open(df_path, 'rb') as f:
+        df = pickle.load(f)
+    return index, df
+
+
+def load_snapshot(version: str | None = None) -> VectorStoreSnapshot:
+    """
+    지정한(없으면 현재 게시된) 스냅샷을 체크섬 검증 후 로드합니다.
+    게시된 스냅샷이 하나도 없으면 vector_store/ 바로 아래의 기존 파일을 'legacy' 버전으로 로드합니다.
+    """
+    version = version or read_current()
+    if version is None:
+        artifact_index, artifact_df = _load_store('artifacts', config.ARTIFACT_INDEX_PATH, config.ARTIFACT_DF_PATH)
+        history_index, history_df = _load_store('history', config.HISTORY_INDEX_PATH, config.HISTORY_DF_PATH)
+        return VectorStoreSnapshot('legacy', artifact_index, artifact_df, history_index, history_df)
+
+    check_version(version)
+    print(f"  - 벡터 스토어 스냅샷 '{version}' 로딩...")
+    manifest = verify_snapshot(version)
+    stores = {}
+    for name, (index_file, df_file) in STORE_FILES.items():
+        stores[name] = _load_store(name, os.path.join(snapshot_path(version), index_file), os.path.join(snapshot_path(version), df_file))
+    return VectorStoreSnapshot(version, *stores['artifacts'], *stores['history'], manifest=manifest)
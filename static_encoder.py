@@ -0,0 +1,216 @@
+# static_encoder.py
+import os
+import re
+import json
+import time
+from collections import Counter
+import numpy as np
+import config
+
+TOKENIZER_FILE = 'tokenizer.json'
+STATIC_EMBEDDINGS_FILE = 'static_embeddings.npz'
+QUERY_VECTORS_FILE = 'query_vectors.npz'
+MANIFEST_FILE = 'manifest.json'
+
+
+def available_memory_mb() -> float | None:
+    """현재 사용 가능한 메모리(MB)를 반환합니다. 확인할 수 없는 환경이면 None."""
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def normalize_question(question: str) -> str:
+    """공백과 문장부호 차이를 무시하고 같은 질문을 찾기 위한 키."""
+    return re.sub(r'[\s?!.,~"\']+', '', str(question))
+
+
+class QueryVectorTable:
+    """자주 묻는 질문의 임베딩을 미리 계산해 두고, 같은 질문이 들어오면 모델 없이 바로 반환합니다."""
+    def __init__(self, questions: list, vectors: np.ndarray):
+        self.vectors = {normalize_question(q): v for q, v in zip(questions, vectors.astype('float32'))}
+
+    @classmethod
+    def load(cls, path: str):
+        if not os.path.exists(path):
+            return cls([], np.zeros((0, 0), dtype='float32'))
+        data = np.load(path, allow_pickle=False)
+        return cls(data['questions'].tolist(), data['vectors'])
+
+    def lookup(self, question: str) -> np.ndarray | None:
+        return self.vectors.get(normalize_question(question))
+
+    def __len__(self):
+        return len(self.vectors)
+
+
+class StaticEmbeddingEncoder:
+    """
+    Transformer 없이 동작하는 경량 인코더.
+    전체 모델로 미리 구한 토큰별 임베딩 표를 SIF 가중 평균한 뒤, 학습된 선형 사상으로
+    기존 FAISS 인덱스와 같은 벡터 공간에 투영합니다. SentenceTransformer.encode와 같은 형태로 호출할 수 있습니다.
+    """
+    def __init__(self, tokenizer, token_ids: np.ndarray, token_vectors: np.ndarray, token_weights: np.ndarray, projection: np.ndarray):
+        self.tokenizer = tokenizer
+        self.token_ids = token_ids
+        self.token_vectors = token_vectors
+        self.token_weights = token_weights
+        self.projection = projection
+
+    @classmethod
+    def load(cls, profile_dir: str = config.LITE_PROFILE_DIR):
+        from tokenizers import Tokenizer
+        tokenizer = Tokenizer.from_file(os.path.join(profile_dir, TOKENIZER_FILE))
+        data = np.load(os.path.join(profile_dir, STATIC_EMBEDDINGS_FILE), allow_pickle=False)
+        return cls(tokenizer, data['token_ids'], data['token_vectors'], data['token_weights'], data['projection'])
+
+    def _pool(self, ids: list) -> np.ndarray:
+        """토큰 ID 목록을 표에 있는 토큰만 골라 가중 평균합니다."""
+        ids = np.asarray(ids, dtype=np.int64)
+        rows = np.searchsorted(self.token_ids, ids)
+        rows = rows[(rows < len(self.token_ids)) & (self.token_ids[np.minimum(rows, len(self.token_ids) - 1)] == ids)]
+        if len(rows) == 0:
+            return np.zeros(self.token_vectors.shape[1], dtype='float32')
+        weights = self.token_weights[rows]
+        return (weights @ self.token_vectors[rows].astype('float32')) / weights.sum()
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        """표에 있는 토큰이 하나도 없는 텍스트는 0 벡터가 되며, 호출하는 쪽에서 검색하지 않도록 걸러야 합니다."""
+        if isinstance(texts, str):
+            texts = [texts]
+        encodings = self.tokenizer.encode_batch(list(texts), add_special_tokens=False)
+        pooled = np.vstack([self._pool(e.ids) for e in encodings]) if encodings else np.zeros((0, self.projection.shape[0]), dtype='float32')
+        # 토큰 수에 따라 달라지는 평균 벡터의 크기를 없앤 뒤 투영합니다.
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        pooled = pooled / np.where(norms > 0, norms, 1)
+        return (pooled @ self.projection).astype('float32')
+
+
+def load_encoder(profile: str = config.EMBEDDING_PROFILE):
+    """
+    서빙 프로필에 맞는 임베딩 인코더를 로드합니다.
+    'auto'는 사용 가능한 메모리가 FULL_PROFILE_MIN_AVAILABLE_MB보다 적으면 'lite'를 고르고,
+    전체 모델 로드에 실패하면 'lite'로 대체합니다. 'full'은 대체하지 않고 오류를 그대로 올립니다.
+
+    Returns:
+        (인코더, 실제 사용한 프로필 이름)
+    """
+    allow_fallback = profile == 'auto'
+    if profile == 'auto':
+        available = available_memory_mb()
+        profile = 'lite' if available is not None and available < config.FULL_PROFILE_MIN_AVAILABLE_MB else 'full'
+        print(f"  - 사용 가능 메모리 {available if available is None else round(available)}MB → '{profile}' 임베딩 프로필 선택.")
+
+    lite_available = os.path.exists(os.path.join(config.LITE_PROFILE_DIR, STATIC_EMBEDDINGS_FILE))
+    if profile == 'lite' and not lite_available:
+        print("  - ⚠️ 경량 프로필이 없어 전체 모델을 사용합니다. (static_encoder.py 실행 필요)")
+
+    if profile == 'full' or not lite_available:
+        try:
+            # torch를 불러오는 무거운 import는 full 프로필에서만 수행합니다.
+            from sentence_transformers import SentenceTransformer
+            return SentenceTransformer(config.EMBEDDING_MODEL), 'full'
+        except Exception as e:
+            if not (allow_fallback and lite_available):
+                raise
+            print(f"  - 🚨 경고: 임베딩 모델 로드 실패 - {e}. 경량 인코더로 대체합니다.")
+
+    encoder = StaticEmbeddingEncoder.load(config.LITE_PROFILE_DIR)
+    print(f"  - 경량 인코더 로드 완료 (토큰 {len(encoder.token_ids)}개).")
+    return encoder, 'lite'
+
+
+def embed_token_ids(model, token_ids: np.ndarray, batch_size: int = 256) -> np.ndarray:
+    """
+    토큰 ID 하나씩을 [CLS] 토큰 [SEP] 입력으로 전체 모델에 통과시켜 토큰 임베딩을 구합니다.
+    토큰을 문자열로 되돌려 다시 토큰화하면 '▁위'와 '위'처럼 다른 토큰이 되므로 ID를 직접 넣습니다.
+    """
+    import torch
+    vectors = []
+    for start in range(0, len(token_ids), batch_size):
+        batch = [model.tokenizer.build_inputs_with_special_tokens([int(i)]) for i in token_ids[start:start + batch_size]]
+        input_ids = torch.tensor(batch, device=model.device)
+        with torch.no_grad():
+            output = model({'input_ids': input_ids, 'attention_mask': torch.ones_like(input_ids)})
+        vectors.append(output['sentence_embedding'].float().cpu().numpy())
+        print(f"    {min(start + batch_size, len(token_ids))}/{len(token_ids)}", end='\r')
+    print()
+    return np.vstack(vectors)
+
+
+def build_lite_profile(model, texts: list, output_dir: str, frequent_questions: list,
+                       sif_a: float | None = 1e-3, ridge_lambda: float = 1e-3, batch_size: int = 256):
+    """
+    전체 임베딩 모델로 경량 프로필을 만듭니다.
+      1. 말뭉치에 등장하는 토큰마다 전체 모델 임베딩을 구해 토큰 표를 만듭니다.
+         sif_a가 주어지면 자주 나오는 토큰일수록 가중치를 낮추고(SIF), None이면 단순 평균합니다.
+      2. 말뭉치 문서의 토큰 표 평균 벡터 → 전체 모델 임베딩으로 가는 선형 사상을 릿지 회귀로 학습합니다.
+         ridge_lambda는 XᵀX 고유값 평균(trace/차원)에 대한 비율이므로 임베딩 차원/문서 수와 관계없이 같은 강도로 정규화됩니다.
+      3. 자주 묻는 질문의 임베딩을 미리 계산해 둡니다.
+    """
+    print(f"🔄 경량 임베딩 프로필 생성 시작 (문서 {len(texts)}개)...")
+    started = time.time()
+    os.makedirs(output_dir, exist_ok=True)
+    backend = model.tokenizer.backend_tokenizer
+
+    encodings = backend.encode_batch(texts, add_special_tokens=False)
+    counts = Counter(token_id for e in encodings for token_id in e.ids)
+    token_ids = np.array(sorted(counts), dtype=np.int64)
+    frequencies = np.array([counts[i] for i in token_ids], dtype='float32') / sum(counts.values())
+    token_weights = (sif_a / (sif_a + frequencies) if sif_a else np.ones_like(frequencies)).astype('float32')
+    print(f"  - 말뭉치 어휘 {len(token_ids)}개 토큰 임베딩 중...")
+    token_vectors = embed_token_ids(model, token_ids, batch_size)
+
+    print("  - 전체 모델 공간으로의 투영 행렬 학습 중...")
+    encoder = StaticEmbeddingEncoder(backend, token_ids, token_vectors, token_weights, np.eye(token_vectors.shape[1], dtype='float32'))
+    pooled = encoder.encode(texts)
+    targets = np.asarray(model.encode(texts, batch_size=32, show_progress_bar=True), dtype='float32')
+    identity = np.eye(pooled.shape[1], dtype='float32')
+    gram = pooled.T @ pooled
+    # (XᵀX + λI) W = XᵀY + λI : 데이터가 적을 때는 항등 사상 쪽으로 수렴하도록 정규화
+    # 토큰 벡터마다 [CLS]/[SEP] 성분이 공통으로 섞여 있어 문서 간 차이는 작은 고유값 방향에 있으므로, λ가 크면 이를 지워 버립니다.
+    penalty = ridge_lambda * np.trace(gram) / gram.shape[0]
+    projection = np.linalg.solve(gram + penalty * identity, pooled.T @ targets + penalty * identity)
+
+    backend.save(os.path.join(output_dir, TOKENIZER_FILE))
+    np.savez(
+        os.path.join(output_dir, STATIC_EMBEDDINGS_FILE),
+        token_ids=token_ids, token_vectors=token_vectors.astype('float16'),
+        token_weights=token_weights, projection=projection.astype('float32'),
+    )
+    np.savez(
+        os.path.join(output_dir, QUERY_VECTORS_FILE),
+        questions=np.array(frequent_questions),
+        vectors=np.asarray(model.encode(frequent_questions), dtype='float32'),
+    )
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump({
+            'embedding_model': config.EMBEDDING_MODEL,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'vocab_size': int(len(token_ids)),
+            'dim': int(token_vectors.shape[1]),
+            'frequent_questions': len(frequent_questions),
+        }, f, ensure_ascii=False, indent=2)
+
+    print(f"✅ 완료: 경량 프로필이 '{output_dir}'에 저장되었습니다. ({time.time() - started:.0f}초)")
+
+
+if __name__ == '__main__':
+    import pandas as pd
+    from sentence_transformers import SentenceTransformer
+
+    print(f"⏳ 임베딩 모델({config.EMBEDDING_MODEL}) 로딩 중...")
+    embedding_model = SentenceTransformer(config.EMBEDDING_MODEL)
+    corpus = (
+        pd.read_csv(os.path.join('data', 'preprocessed_artifacts_final_with_images.csv'))['rag_document'].fillna('').tolist()
+        + pd.read_csv(os.path.join('data', 'preprocessed_history_chunks_sectioned.csv'))['text_chunk'].fillna('').tolist()
+    )
+    build_lite_profile(embedding_model, corpus, config.LITE_PROFILE_DIR, config.FREQUENT_QUESTIONS)
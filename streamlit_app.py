@@ -2,7 +2,8 @@
 import streamlit as st
 from chatbot import chatbot_instance 
 from PIL import Image 
-import os
+import config
+import image_processor
 
 # --- 페이지 기본 설정 ---
 try:
@@ -87,11 +88,12 @@ def handle_query(prompt):
         response_text = result["answer"]
         if result.get("metadata"):
             meta = result["metadata"][0]
-            if meta.get("image_url"):
-                file_name = meta["image_url"].split('/')[-1]
-                local_image_path = os.path.join("data", "extracted_images", file_name)
-                if os.path.exists(local_image_path):
-                    assistant_response["image"] = local_image_path
+            # 파일 시스템 탐색 없이 메모리에 캐시된 이미지 매니페스트에서 썸네일을 조회
+            image_entry = image_processor.lookup_image(meta.get("image_url"))
+            if image_entry:
+                image_path, variant, _ = image_processor.select_variant(image_entry, accept="image/webp")
+                assistant_response["image"] = image_path
+                assistant_response["image_bytes"] = variant["bytes"]
             links = []
             if meta.get("MUCH_URL"):
                 links.append(f"[자세히 보기]({meta['MUCH_URL']})")
@@ -139,9 +141,7 @@ if not st.session_state.chat_history:
     st.markdown("---")
     
     st.markdown("##### ✨ 이런 질문은 어떠세요?")
-    suggested_questions = ["무령왕릉은 언제, 어떻게 발견되었나요?", "진묘수에 대해 자세히 알려주세요.", "왕의 귀걸이는 어떻게 생겼어?"]
-    
-    for q in suggested_questions:
+    for q in config.SUGGESTED_QUESTIONS:
         if st.button(q, use_container_width=True, key=q):
             handle_query(q)
             st.rerun()
@@ -152,6 +152,11 @@ for message in st.session_state.chat_history:
     with st.chat_message(message["role"], avatar=avatar_to_use):
         if message["role"] == "assistant" and "image" in message:
             st.image(message["image"])
+            # 답변별 이미지 전송량은 처음 표시될 때 한 번만 기록
+            # (st.image는 프런트엔드에 요소를 전달할 뿐이라 실제 렌더링 지연은 서버에서 측정할 수 없음)
+            if not message.get("image_reported"):
+                print(f"  🖼️ 이미지 제공: {message['image']} - 전송 {message.get('image_bytes', 0) / 1024:.1f}KB")
+                message["image_reported"] = True
         st.markdown(message["content"])
 
 # 사용자 입력 처리
@@ -1,19 +1,28 @@
 # vector_store_builder.py
 import pandas as pd
 import faiss
-from sentence_transformers import SentenceTransformer
 import os
 import pickle
+import shutil
+import config
+import snapshot_store
+
+def build_index(embeddings):
+    """임베딩 행렬로 검색용 FAISS 인덱스를 만듭니다. (벤치마크도 같은 함수를 사용합니다)"""
+    index = faiss.IndexFlatL2(embeddings.shape[1])
+    index.add(embeddings)
+    return index
 
 def build_and_save_vector_store(
     data_path: str, 
     text_column: str, 
     index_output_path: str,
     dataframe_output_path: str,
-    model: SentenceTransformer
+    model: "SentenceTransformer"
 ):
     """
     주어진 CSV 파일의 텍스트 데이터를 임베딩하고, FAISS 인덱스와 원본 데이터프레임을 저장합니다.
+    성공하면 스냅샷 매니페스트에 기록할 인덱스 정보(index_type, ntotal, dim, rows)를, 실패하면 None을 반환합니다.
     """
     print(f"🔄 '{data_path}' 파일 처리 시작...")
     
@@ -24,7 +33,7 @@ def build_and_save_vector_store(
         
         if not texts:
             print(f"🚨 경고: '{data_path}'에 처리할 텍스트가 없습니다.")
-            return
+            return None
 
         print(f"  - 텍스트 데이터 로드 완료. 총 {len(texts)}개 항목 임베딩 중...")
         
@@ -33,8 +42,7 @@ def build_and_save_vector_store(
         
         print(f"  - 임베딩 완료. 벡터 차원: {embeddings_np.shape[1]}")
         
-        index = faiss.IndexFlatL2(embeddings_np.shape[1])
-        index.add(embeddings_np)
+        index = build_index(embeddings_np)
         
         print(f"  - FAISS 인덱스 구축 완료. 인덱스에 {index.ntotal}개 벡터 포함.")
         
@@ -45,33 +53,63 @@ def build_and_save_vector_store(
             pickle.dump(df, f)
             
         print(f"✅ 완료: 벡터 DB는 '{index_output_path}'에, 데이터는 '{dataframe_output_path}'에 저장되었습니다.")
+        return {
+            'index_type': type(index).__name__,
+            'ntotal': int(index.ntotal),
+            'dim': int(index.d),
+            'rows': len(df),
+        }
 
     except FileNotFoundError:
         print(f"🚨 오류: 입력 파일 '{data_path}'을 찾을 수 없습니다.")
     except Exception as e:
         print(f"🚨 오류: 벡터 스토어 구축 중 예상치 못한 문제가 발생했습니다 - {e}")
+    return None
 
 if __name__ == '__main__':
-    print("⏳ 임베딩 모델(upskyy/bge-m3-korean) 로딩 중...")
-    embedding_model = SentenceTransformer('upskyy/bge-m3-korean')
+    # torch를 불러오는 무거운 import는 실제 구축 시에만 수행합니다. (벤치마크는 build_index만 사용)
+    from sentence_transformers import SentenceTransformer
+
+    print(f"⏳ 임베딩 모델({config.EMBEDDING_MODEL}) 로딩 중...")
+    embedding_model = SentenceTransformer(config.EMBEDDING_MODEL)
     print("✅ 임베딩 모델 로드 완료!")
 
-    # --- 유물 정보 벡터 DB 구축 ---
-    build_and_save_vector_store(
-        data_path=os.path.join('data', 'preprocessed_artifacts_final_with_images.csv'),
-        text_column='rag_document',
-        index_output_path=os.path.join('vector_store', 'artifacts.index'),
-        dataframe_output_path=os.path.join('vector_store', 'artifacts_df.pkl'),
-        model=embedding_model
-    )
-    
-    print("-" * 50)
+    # 새 스냅샷은 임시 폴더에 모두 만든 뒤 한 번에 게시합니다. (실행 중인 서버는 기존 스냅샷을 계속 사용)
+    version = snapshot_store.new_version()
+    staging_dir = snapshot_store.staging_path(version)
+    stores = {}
+    published = False
+    try:
+        # --- 유물 정보 벡터 DB 구축 ---
+        stores['artifacts'] = build_and_save_vector_store(
+            data_path=os.path.join('data', 'preprocessed_artifacts_final_with_images.csv'),
+            text_column='rag_document',
+            index_output_path=os.path.join(staging_dir, 'artifacts.index'),
+            dataframe_output_path=os.path.join(staging_dir, 'artifacts_df.pkl'),
+            model=embedding_model
+        )
+
+        print("-" * 50)
+
+        # --- 역사 정보 벡터 DB 구축 ---
+        stores['history'] = build_and_save_vector_store(
+            data_path=os.path.join('data', 'preprocessed_history_chunks_sectioned.csv'),
+            text_column='text_chunk',
+            index_output_path=os.path.join(staging_dir, 'history.index'),
+            dataframe_output_path=os.path.join(staging_dir, 'history_df.pkl'),
+            model=embedding_model
+        )
+
+        print("-" * 50)
 
-    # --- 역사 정보 벡터 DB 구축 ---
-    build_and_save_vector_store(
-        data_path=os.path.join('data', 'preprocessed_history_chunks_sectioned.csv'),
-        text_column='text_chunk',
-        index_output_path=os.path.join('vector_store', 'history.index'),
-        dataframe_output_path=os.path.join('vector_store', 'history_df.pkl'),
-        model=embedding_model
-    )
+        if all(stores.values()):
+            snapshot_store.publish_snapshot(staging_dir, version, config.EMBEDDING_MODEL, stores)
+            published = True
+            snapshot_store.prune_snapshots()
+            print(f"✅ 스냅샷 '{version}' 게시 완료. 실행 중인 서버는 {config.SNAPSHOT_POLL_INTERVAL}초 안에 새 스냅샷으로 교체됩니다.")
+        else:
+            print("🚨 일부 벡터 스토어 구축에 실패하여 스냅샷을 게시하지 않았습니다. (기존 스냅샷 유지)")
+    finally:
+        # 구축/게시 중 예외(같은 버전 폴더가 이미 있는 경우 등)가 나도 임시 폴더를 남기지 않습니다.
+        if not published:
+            shutil.rmtree(staging_dir, ignore_errors=True)